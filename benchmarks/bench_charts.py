@@ -0,0 +1,80 @@
+"""pytest-benchmark suite timing every chart type over a sweep of sizes.
+
+Each registered chart type is built at sizes from 10 to 10^6 points (a
+square heatmap of about that many cells, up to 10^3 x 10^3), and three stages
+are benchmarked separately on the same data:
+
+* ``build``: drawing the data on a new figure (:func:`charts.builders.build_figure`),
+* ``png``: ``savefig`` to PNG,
+* ``html``: ``mpld3.fig_to_html``.
+
+The file does not match ``test_*.py``, so the default ``pytest`` run never
+collects it; pass it explicitly.  Sizes above ``--bench-max-size`` (default
+10^4) are skipped, so the full sweep, which takes hours for the charts with
+one artist per point (pie, bar, stem), is opt-in::
+
+    python -m pytest benchmarks/bench_charts.py --benchmark-autosave
+    python -m pytest benchmarks/bench_charts.py -k line_chart --bench-max-size 1000000
+
+Results are stored as JSON under ``.benchmarks/`` (or ``--benchmark-json
+PATH``).  A later run compared against a saved one fails if any benchmark
+got slower than the threshold::
+
+    python -m pytest benchmarks/bench_charts.py --benchmark-compare=0001 \\
+        --benchmark-compare-fail=median:10%
+"""
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import pytest
+
+from charts.builders import build_figure
+from charts.registry import CHART_REGISTRY, Job, job_rng
+from charts.render import render
+
+SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+STAGES = ("build", "png", "html")
+
+
+def pytest_generate_tests(metafunc):
+    if "size" in metafunc.fixturenames:
+        max_size = metafunc.config.getoption("bench_max_size")
+        metafunc.parametrize("size", [size for size in SIZES if size <= max_size])
+
+
+def make_data(chart_type, size):
+    # Heatmap sizes are side lengths: benchmark the square closest to ``size`` cells.
+    n = math.isqrt(size) if chart_type == "heatmap" else size
+    return CHART_REGISTRY[chart_type].make_data(n, job_rng(Job(chart_type, 0, n)))
+
+
+def _rounds(size):
+    # pytest-benchmark would run seconds-long calls at least 5 times each.
+    return 5 if size <= 10_000 else 1
+
+
+@pytest.mark.parametrize("stage", STAGES)
+@pytest.mark.parametrize("chart_type", list(CHART_REGISTRY))
+def test_chart(benchmark, chart_type, size, stage):
+    data = make_data(chart_type, size)
+    benchmark.group = f"{chart_type}-{stage}"
+    benchmark.extra_info.update(chart_type=chart_type, size=size, stage=stage)
+
+    if stage == "build":
+        func = lambda: build_figure(chart_type, data)  # noqa: E731
+    else:
+        fig = build_figure(chart_type, data)
+        if stage == "png":
+            func = lambda: render(fig, "png")  # noqa: E731
+        else:
+            import mpld3
+
+            func = lambda: mpld3.fig_to_html(fig)  # noqa: E731
+    benchmark.pedantic(func, rounds=_rounds(size), warmup_rounds=1 if size <= 10_000 else 0)
@@ -0,0 +1,60 @@
+"""Compare :func:`charts.render.render_many` with a serial ``savefig`` loop.
+
+Builds ``--count`` small figures (cycling through every chart type, about as
+many as the parametrized unit test cases) and times rendering them to PNG
+serially and with each ``--workers`` count::
+
+    python benchmarks/bench_render_many.py --count 700 --workers 2,4,8
+"""
+import os
+import sys
+import time
+import argparse
+from itertools import cycle, islice
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from charts.builders import build_figure
+from charts.registry import CHART_REGISTRY, iter_jobs, job_rng
+from charts.render import render, render_many
+
+
+def build_figures(count):
+    figs = []
+    for job in islice(cycle(list(iter_jobs())), count):
+        data = CHART_REGISTRY[job.chart_type].make_data(job.size, job_rng(job))
+        figs.append(build_figure(job.chart_type, data))
+    return figs
+
+
+def best_of(repeat, func):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=700)
+    parser.add_argument("--workers", default=f"2,4,{os.cpu_count() or 1}",
+                        help="comma separated worker counts to try")
+    parser.add_argument("--format", default="png")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    figs = build_figures(args.count)
+    render_many(figs, args.format, workers=1)  # warm up font and glyph caches
+
+    serial = best_of(args.repeat, lambda: [render(fig, args.format) for fig in figs])
+    print(f"{args.count} figures, {os.cpu_count()} CPUs, best of {args.repeat}")
+    print(f"{'serial loop':>16}: {serial:8.3f} s")
+    for workers in sorted({int(w) for w in args.workers.split(",")}):
+        elapsed = best_of(args.repeat, lambda: render_many(figs, args.format, workers=workers))
+        print(f"{f'render_many x{workers}':>16}: {elapsed:8.3f} s  ({serial / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+def pytest_addoption(parser):
+    parser.addoption("--bench-max-size", type=int, default=10_000,
+                     help="largest number of points in benchmarks/bench_charts.py "
+                          "(default: 10000)")
@@ -0,0 +1,5 @@
+"""Chart generation package for the e2e test fixtures.
+
+``charts/generate.py`` is the command line entry point; the chart builders
+themselves live in :mod:`charts.builders`.
+"""
@@ -0,0 +1,46 @@
+"""Local copies of the d3 and mpld3 libraries shared by every chart page.
+
+mpld3 pages load d3 and mpld3 from their CDNs by default, which fails
+without network access.  :func:`install` copies the minified libraries that
+ship with the mpld3 package into ``<output>/assets/`` once per run, and every
+page references them by a relative URL, so charts open offline from
+``file://`` and the browser caches the libraries across pages.
+
+The libraries are located without importing mpld3, which imports pyplot.
+"""
+import os
+import shutil
+from importlib.util import find_spec
+
+ASSETS_DIR = "assets"
+
+
+def library_files():
+    """Return the bundled libraries as ``{fig_to_html keyword: file path}``."""
+    from importlib.metadata import version
+
+    js_dir = os.path.join(find_spec("mpld3").submodule_search_locations[0], "js")
+    return {
+        "d3_url": os.path.join(js_dir, "d3.v5.min.js"),
+        "mpld3_url": os.path.join(js_dir, f"mpld3.v{version('mpld3')}.min.js"),
+    }
+
+
+def urls():
+    """Return the ``d3_url``/``mpld3_url`` keywords of ``mpld3.fig_to_html``
+    for pages written next to an installed ``assets`` directory."""
+    return {keyword: f"{ASSETS_DIR}/{os.path.basename(source)}"
+            for keyword, source in library_files().items()}
+
+
+def install(output_dir):
+    """Copy the libraries to ``output_dir/assets`` unless already there.
+
+    Returns the :func:`urls` of pages written to ``output_dir``.
+    """
+    os.makedirs(os.path.join(output_dir, ASSETS_DIR), exist_ok=True)
+    for source in library_files().values():
+        target = os.path.join(output_dir, ASSETS_DIR, os.path.basename(source))
+        if not os.path.exists(target) or os.path.getsize(target) != os.path.getsize(source):
+            shutil.copyfile(source, target)
+    return urls()
@@ -0,0 +1,190 @@
+"""Chart builders used by ``charts/generate.py``.
+
+Every chart type is split into a data function, which takes the chart size
+and the job's ``np.random.Generator`` and returns a dict of NumPy arrays and
+plain values, and a draw function, which draws that dict onto an empty
+``Axes`` handed out by the generator's figure pool.  Keeping the two apart
+lets the generator hash the data and skip drawing entirely when the output is
+already up to date.  Builders are registered with their default sizes in
+:data:`charts.registry.CHART_REGISTRY` in the order the charts are generated.
+
+Only the object-oriented matplotlib API is used here, never pyplot, so
+charts can be built and rendered concurrently from a thread pool.  Summary
+statistics (histogram bins, box plot quartiles) come from :mod:`charts.stats`
+and are drawn as is, so the figure and the test data share the same numbers.
+"""
+import numpy as np
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import Normalize
+
+from charts.figpool import new_figure
+from charts.registry import CHART_REGISTRY, register
+from charts.stats import box_stats, bxp_stats, histogram_stats
+
+
+def build_figure(chart_type, data):
+    """Draw ``data`` as ``chart_type`` on a new figure and return it."""
+    spec = CHART_REGISTRY[chart_type]
+    fig = new_figure(spec.projection)
+    spec.draw(fig.axes[0], data)
+    return fig
+
+
+# 1. Line Chart
+def line_chart_data(n, rng):
+    x = np.linspace(0, 10, n)
+    return {"x": x, "y": np.sin(x)}
+
+
+@register("line_chart", line_chart_data, sizes=[10, 100], downsample=("x", "y"),
+          pyramid=("line", "x", "y"))
+def line_chart(ax, data):
+    ax.plot(data["x"], data["y"], label="sin(x)")
+    ax.set_title("Line Chart")
+
+
+# 2. Bar Chart
+def bar_chart_data(n, rng):
+    x = np.arange(n)
+    return {"x": x, "y": rng.integers(1, 10, len(x))}
+
+
+@register("bar_chart", bar_chart_data, sizes=[5, 20])
+def bar_chart(ax, data):
+    ax.bar(data["x"], data["y"])
+    ax.set_title("Bar Chart")
+
+
+# 3. Horizontal Bar Chart
+def horizontal_bar_chart_data(n, rng):
+    x = np.arange(n)
+    return {"x": x, "y": rng.integers(1, 10, len(x))}
+
+
+@register("horizontal_bar_chart", horizontal_bar_chart_data, sizes=[5, 20])
+def horizontal_bar_chart(ax, data):
+    ax.barh(data["x"], data["y"])
+    ax.set_title("Horizontal Bar Chart")
+
+
+# 4. Pie Chart
+def pie_chart_data(n, rng):
+    data = rng.integers(1, 10, n)
+    return {"data": data, "labels": [f"Slice {j}" for j in range(len(data))]}
+
+
+@register("pie_chart", pie_chart_data, sizes=[4, 8])
+def pie_chart(ax, data):
+    ax.pie(data["data"], labels=data["labels"])
+    ax.set_title("Pie Chart")
+
+
+# 5. Scatter Plot
+def scatter_plot_data(n, rng):
+    return {"x": rng.random(n), "y": rng.random(n)}
+
+
+@register("scatter_plot", scatter_plot_data, sizes=[10, 100], pyramid=("scatter", "x", "y"),
+          canvas=("x", "y"))
+def scatter_plot(ax, data):
+    ax.scatter(data["x"], data["y"])
+    ax.set_title("Scatter Plot")
+
+
+# 6. Histogram
+def histogram_data(n, rng):
+    data = rng.standard_normal(n)
+    return {"data": data, **histogram_stats(data, bins=10)}
+
+
+@register("histogram", histogram_data, sizes=[100, 1000], modules=["charts.stats"])
+def histogram(ax, data):
+    ax.stairs(data["counts"], data["bins"], fill=True)
+    ax.set_title("Histogram")
+
+
+# 7. Box Plot
+def box_plot_data(n, rng):
+    samples = rng.standard_normal((4, n))
+    return {"data": list(samples), **box_stats(samples)}
+
+
+@register("box_plot", box_plot_data, sizes=[10, 100], modules=["charts.stats"])
+def box_plot(ax, data):
+    ax.bxp(bxp_stats(data))
+    ax.set_title("Box Plot")
+
+
+# 8. Area Chart
+def area_chart_data(n, rng):
+    x = np.linspace(0, 10, n)
+    return {"x": x, "y": np.abs(np.sin(x))}
+
+
+@register("area_chart", area_chart_data, sizes=[10, 100], downsample=("x", "y"),
+          pyramid=("area", "x", "y"))
+def area_chart(ax, data):
+    ax.fill_between(data["x"], data["y"], alpha=0.5)
+    ax.set_title("Area Chart")
+
+
+# 9. Stem Plot
+def stem_plot_data(n, rng):
+    x = np.arange(n)
+    return {"x": x, "y": rng.random(len(x))}
+
+
+@register("stem_plot", stem_plot_data, sizes=[10, 50])
+def stem_plot(ax, data):
+    ax.stem(data["x"], data["y"])
+    ax.set_title("Stem Plot")
+
+
+# 10. Heatmap
+def heatmap_data(n, rng):
+    return {"data": rng.random((n, n))}
+
+
+@register("heatmap", heatmap_data, sizes=[5, 20], raster=("data", "viridis"))
+def heatmap(ax, data):
+    if "image" in data:
+        # Raster export: the matrix was colormapped to RGBA ahead of time.
+        ax.imshow(data["image"])
+        norm = Normalize(data["vmin"], data["vmax"])
+        ax.figure.colorbar(ScalarMappable(norm, data["cmap"]), ax=ax)
+    else:
+        cax = ax.imshow(data["data"], cmap="viridis")
+        ax.figure.colorbar(cax)
+    ax.set_title("Heatmap")
+
+
+# 11. Stacked Bar Chart
+def stacked_bar_chart_data(n, rng):
+    x = np.arange(n)
+    return {
+        "x": x,
+        "y1": rng.integers(1, 5, size=len(x)),
+        "y2": rng.integers(1, 5, size=len(x)),
+    }
+
+
+@register("stacked_bar_chart", stacked_bar_chart_data, sizes=[5, 20])
+def stacked_bar_chart(ax, data):
+    ax.bar(data["x"], data["y1"], label="A")
+    ax.bar(data["x"], data["y2"], bottom=data["y1"], label="B")
+    ax.legend()
+    ax.set_title("Stacked Bar Chart")
+
+
+# 12. Polar Plot
+def polar_plot_data(n, rng):
+    theta = np.linspace(0, 2 * np.pi, n)
+    r = np.abs(np.sin(theta) * (1 + 0.1 * rng.standard_normal(len(theta))))
+    return {"theta": theta, "r": r}
+
+
+@register("polar_plot", polar_plot_data, sizes=[10, 100], projection="polar",
+          downsample=("theta", "r"))
+def polar_plot(ax, data):
+    ax.plot(data["theta"], data["r"])
+    ax.set_title("Polar Plot")
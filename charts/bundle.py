@@ -0,0 +1,77 @@
+"""Bundle pages holding many chart figures each.
+
+Every chart page is a fragment that draws its figure straight away when
+mpld3 is already loaded.  :func:`write_bundles` concatenates up to ``size``
+of those pages into ``<output>/bundles/bundle_<n>.html``, behind one pair of
+``<script>`` tags loading d3 and mpld3, and wraps each in a container whose
+id is the chart key (``<chart>_<version>``).  One navigation then checks a
+whole bundle of figures.  ``bundles/bundles.json`` lists the charts of every
+bundle, in the order they were generated.
+"""
+import html
+import json
+import os
+import shutil
+
+BUNDLES_DIR = "bundles"
+MANIFEST_NAME = "bundles.json"
+
+
+def _library_urls(asset_urls):
+    if asset_urls is None:
+        from mpld3.urls import D3_URL, MPLD3_URL
+
+        return D3_URL, MPLD3_URL
+    # Asset URLs are relative to the output directory, one level up.
+    return tuple(f"../{asset_urls[key]}" for key in ("d3_url", "mpld3_url"))
+
+
+def _remove_previous(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        return
+    for bundle in previous.get("bundles", []):
+        path = os.path.join(directory, bundle["file"])
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def write_bundles(pages, output_dir, size, asset_urls=None):
+    """Write the ``(job, html_path)`` chart ``pages`` in bundles of ``size``.
+
+    ``asset_urls`` are the ones the pages were written with (``None`` for
+    the CDN copies).  Bundles of a previous run are removed first.  Returns
+    the manifest.
+    """
+    directory = os.path.join(output_dir, BUNDLES_DIR)
+    os.makedirs(directory, exist_ok=True)
+    _remove_previous(directory)
+    d3_url, mpld3_url = _library_urls(asset_urls)
+
+    pages = list(pages)
+    manifest = {"bundle_size": size, "bundles": []}
+    for start in range(0, len(pages), size):
+        name = f"bundle_{start // size + 1}.html"
+        charts = []
+        with open(os.path.join(directory, name), "w") as out:
+            out.write(f'<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+                      f"<title>Charts {start + 1}-{start + len(pages[start:start + size])}</title>\n"
+                      f'<script src="{html.escape(d3_url)}"></script>\n'
+                      f'<script src="{html.escape(mpld3_url)}"></script>\n'
+                      f"</head>\n<body>\n")
+            for job, html_path in pages[start:start + size]:
+                key = f"{job.chart_type}_{job.version}"
+                out.write(f'<div class="chart" id="{key}" data-chart-type="{job.chart_type}" '
+                          f'data-version="{job.version}">\n')
+                with open(html_path) as page:
+                    shutil.copyfileobj(page, out)
+                out.write("\n</div>\n")
+                charts.append({"id": key, "chart_type": job.chart_type, "version": job.version})
+            out.write("</body>\n</html>\n")
+        manifest["bundles"].append({"file": name, "charts": charts})
+
+    with open(os.path.join(directory, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
@@ -0,0 +1,158 @@
+"""Content-addressed cache of generated charts.
+
+Each output is keyed by a hash of its input data, the source of the functions
+that produce it and of the helper and export modules they rely on, the
+options it is written with and the matplotlib/mpld3/NumPy versions.  The
+hashes of the last run are stored in a JSON manifest next to the HTML files;
+when a job's hash matches its manifest entry and the files still exist,
+rendering is skipped.
+
+Entries also record the :func:`dependency_key` of each output: the hash of
+its builder source and of the helper and export modules that chart uses, its
+size, seed and options.  The key is known before the chart data is made, so
+with ``--changed-only`` outputs whose key is unchanged are skipped without
+synthesizing or hashing their data at all.
+"""
+import hashlib
+import inspect
+import json
+import os
+from functools import lru_cache
+from importlib.metadata import version
+from importlib.util import find_spec
+
+import numpy as np
+
+MANIFEST_NAME = ".manifest.json"
+
+# Read from the package metadata so that hashing does not import mpld3 (and
+# with it pyplot).
+LIBRARY_VERSIONS = {name: version(name) for name in ("matplotlib", "mpld3", "numpy")}
+
+
+def _update(h, value):
+    # Feed ``value`` into ``h`` without converting arrays to Python lists.
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        h.update(f"ndarray:{value.dtype.str}:{value.shape}:".encode())
+        h.update(value.data)
+    elif isinstance(value, dict):
+        h.update(b"dict:%d:" % len(value))
+        for key in sorted(value):
+            _update(h, key)
+            _update(h, value[key])
+    elif isinstance(value, (list, tuple)):
+        h.update(b"list:%d:" % len(value))
+        for item in value:
+            _update(h, item)
+    else:
+        h.update(f"{type(value).__name__}:{value!r};".encode())
+
+
+@lru_cache(maxsize=None)
+def modules_digest(names):
+    """Return the hex digest of the source files of the modules ``names``.
+
+    The files are read without importing the modules, so hashing does not
+    load the optional plugins.
+    """
+    h = hashlib.sha256()
+    for name in names:
+        with open(find_spec(name).origin, "rb") as f:
+            h.update(f"{name}:".encode())
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def content_hash(data, *funcs, options=None, modules=()):
+    """Return the hex digest of ``data``, the source of ``funcs`` and of the
+    modules named in ``modules``, the output ``options`` and the library
+    versions."""
+    h = hashlib.sha256()
+    _update(h, data)
+    _update(h, options or {})
+    for func in funcs:
+        _update(h, inspect.getsource(func))
+    _update(h, modules_digest(tuple(modules)))
+    _update(h, LIBRARY_VERSIONS)
+    return h.hexdigest()
+
+
+def dependency_key(funcs, size, seed, options=None, modules=()):
+    """Return what an output is built from, short of its data.
+
+    That is the source hash of ``funcs`` and of the modules named in
+    ``modules``, the ``size`` and ``seed`` the data is made from and a hash
+    of the output ``options`` and library versions, as a JSON-serializable
+    dict.
+    """
+    source = hashlib.sha256()
+    for func in funcs:
+        _update(source, inspect.getsource(func))
+    _update(source, modules_digest(tuple(modules)))
+    params = hashlib.sha256()
+    _update(params, options or {})
+    _update(params, LIBRARY_VERSIONS)
+    return {"source": source.hexdigest(), "size": size, "seed": seed,
+            "options": params.hexdigest()}
+
+
+class OutputCache:
+    """Manifest of ``{output key: {"chart_type", "hash", "files", "deps"}}`` entries."""
+
+    def __init__(self, path, entries=None):
+        self.path = path
+        self.entries = entries if entries is not None else {}
+
+    @classmethod
+    def load(cls, directory):
+        path = os.path.join(directory, MANIFEST_NAME)
+        try:
+            with open(path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = {}
+        return cls(path, entries)
+
+    def is_fresh(self, key, digest, files):
+        """Whether ``key`` was last built from ``digest`` to exactly ``files``
+        and they all exist."""
+        entry = self.entries.get(key)
+        return (
+            entry is not None
+            and entry["hash"] == digest
+            and entry["files"] == list(files)
+            and all(os.path.exists(p) for p in entry["files"])
+        )
+
+    def is_unchanged(self, key, deps):
+        """Whether ``key`` was last built from the :func:`dependency_key` ``deps``
+        and its files exist."""
+        entry = self.entries.get(key)
+        return (
+            entry is not None
+            and entry.get("deps") == deps
+            and all(os.path.exists(p) for p in entry["files"])
+        )
+
+    def record(self, key, chart_type, digest, files, deps=None):
+        self.entries[key] = {"chart_type": chart_type, "hash": digest, "files": list(files),
+                             "deps": deps}
+
+    def evict(self, chart_types):
+        """Drop entries, and delete their files, for chart types not in ``chart_types``.
+
+        Returns the evicted keys.
+        """
+        stale = [k for k, e in self.entries.items() if e["chart_type"] not in chart_types]
+        for key in stale:
+            for path in self.entries.pop(key)["files"]:
+                if os.path.exists(path):
+                    os.remove(path)
+        return stale
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,100 @@
+"""Canvas rendering of large scatter plots.
+
+mpld3 exports every scatter point as its own SVG ``<path>``, so a page with
+100k points has a 100k-node DOM.  :func:`attach` replaces the scatter
+collection with a :class:`ScatterCanvas` plugin instead: the points are
+written once ahead of the figure as a packed ``float32`` array of
+``x0, y0, x1, y1, ...`` (see :mod:`charts.pagedata`) and drawn onto a single
+``<canvas>`` inside the axes, redrawn on zoom and pan.  The axes, ticks,
+title and toolbar are still regular mpld3 SVG.
+"""
+import numpy as np
+from matplotlib.colors import to_hex
+from mpld3 import plugins, utils
+
+from charts import pagedata
+
+
+class ScatterCanvas(pagedata.DataPlugin):
+    """Draw the points of a scatter collection on a canvas."""
+
+    JAVASCRIPT = pagedata.JAVASCRIPT + r"""
+    mpld3.register_plugin("scattercanvas", ScatterCanvas);
+    ScatterCanvas.prototype = Object.create(mpld3.Plugin.prototype);
+    ScatterCanvas.prototype.constructor = ScatterCanvas;
+    ScatterCanvas.prototype.requiredProps = ["id", "axid", "radius", "color"];
+    ScatterCanvas.prototype.defaultProps = {alpha: 1};
+    function ScatterCanvas(fig, props) {
+        mpld3.Plugin.call(this, fig, props);
+    }
+
+    ScatterCanvas.prototype.draw = function() {
+        var ax = mpld3.get_element(this.props.axid, this.fig);
+        this.ax = ax;
+        this.points = pluginData.decode(pluginData.take(this.props.id).points, Float32Array);
+        this.ratio = window.devicePixelRatio || 1;
+        // Inside the clipped paths container, but outside the zoomed group:
+        // the canvas is redrawn for each zoom instead of being scaled.
+        var holder = ax.pathsContainer.append("foreignObject")
+            .attr("width", ax.width).attr("height", ax.height)
+            .attr("class", "mpld3-scattercanvas")
+            .style("pointer-events", "none");
+        this.canvas = holder.append("xhtml:canvas")
+            .attr("width", Math.round(ax.width * this.ratio))
+            .attr("height", Math.round(ax.height * this.ratio))
+            .style("width", ax.width + "px").style("height", ax.height + "px")
+            .node();
+        // Axes call zoomed() on each of their elements when zoomed.
+        ax.elements.push(this);
+        this.zoomed(d3.zoomIdentity);
+    };
+
+    ScatterCanvas.prototype.zoomed = function(transform) {
+        var ax = this.ax, r = this.props.radius, points = this.points;
+        var ctx = this.canvas.getContext("2d");
+        ctx.setTransform(this.ratio, 0, 0, this.ratio, 0, 0);
+        ctx.clearRect(0, 0, ax.width, ax.height);
+        ctx.fillStyle = this.props.color;
+        ctx.globalAlpha = this.props.alpha;
+        ctx.beginPath();
+        for (var i = 0; i < points.length; i += 2) {
+            var px = transform.applyX(ax.x(points[i]));
+            var py = transform.applyY(ax.y(points[i + 1]));
+            if (px < -r || py < -r || px > ax.width + r || py > ax.height + r) continue;
+            ctx.moveTo(px + r, py);
+            ctx.arc(px, py, r, 0, 2 * Math.PI);
+        }
+        ctx.fill();
+    };
+    """
+
+    def __init__(self, ax, collection, x, y):
+        facecolor = collection.get_facecolor()[0]
+        size = collection.get_sizes()[0]
+        self.dict_ = {
+            "type": "scattercanvas",
+            "id": utils.get_id(collection),
+            "axid": utils.get_id(ax),
+            # Marker sizes are areas in points^2; mpld3 draws at the figure dpi.
+            "radius": float(np.sqrt(size) / 2 * ax.figure.dpi / 72),
+            "color": to_hex(facecolor),
+            "alpha": float(facecolor[3]),
+            "count": len(x),
+        }
+        self.data = {"points": pagedata.encode(np.column_stack([x, y]), "<f4")}
+
+
+def attach(fig, x, y):
+    """Move the scatter collection drawn on ``fig`` to a :class:`ScatterCanvas`.
+
+    The collection is removed from the axes after its points were added to
+    the data limits, so the axes keep the same range.  Returns the plugin;
+    its :meth:`~charts.pagedata.DataPlugin.data_script` must be written ahead
+    of the figure HTML.
+    """
+    ax = fig.axes[0]
+    collection = ax.collections[-1]
+    plugin = ScatterCanvas(ax, collection, x, y)
+    collection.remove()
+    plugins.connect(fig, plugin)
+    return plugin
@@ -0,0 +1,82 @@
+"""Level-of-detail reduction of line-like data before export.
+
+Both reducers return the sorted indices of the points to keep, so the same
+selection can be applied to every array of a chart and recorded in its test
+data.  The first and last points are always kept.
+
+``lttb``
+    Largest-Triangle-Three-Buckets: one point per bucket, chosen to keep the
+    visual shape of the line.
+``minmax``
+    The minimum and maximum of every bucket, which preserves the envelope of
+    the signal (spikes included) at up to two points per bucket.
+"""
+import numpy as np
+
+METHODS = ("lttb", "minmax")
+
+
+def lttb(x, y, n_out):
+    """Return the indices of ``n_out`` points chosen by LTTB."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        raise ValueError("LTTB needs at least 3 output points")
+
+    # Buckets over the points between the first and the last one.
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    indices = np.empty(n_out, dtype=np.intp)
+    indices[0], indices[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        start, stop = edges[b], edges[b + 1]
+        # Average of the next bucket (or the last point for the final bucket).
+        if b + 2 < len(edges):
+            next_x = x[stop:edges[b + 2]].mean()
+            next_y = y[stop:edges[b + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        # Twice the triangle area for every candidate in the bucket.
+        area = np.abs(
+            (x[prev] - next_x) * (y[start:stop] - y[prev])
+            - (x[prev] - x[start:stop]) * (next_y - y[prev])
+        )
+        prev = start + int(np.argmax(area))
+        indices[b + 1] = prev
+    return indices
+
+
+def minmax(x, y, n_buckets):
+    """Return the indices of the minimum and maximum of each of ``n_buckets``."""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if 2 * n_buckets + 2 >= n or n_buckets < 1:
+        return np.arange(n)
+
+    size = -(-n // n_buckets)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    rows = padded.reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size
+    lows = offsets + np.argmin(np.where(np.isnan(rows), np.inf, rows), axis=1)
+    highs = offsets + np.argmax(np.where(np.isnan(rows), -np.inf, rows), axis=1)
+    keep = np.concatenate(([0, n - 1], lows, highs))
+    return np.unique(keep[keep < n])
+
+
+def reduce_points(x, y, max_points, method="lttb"):
+    """Return the indices of at most ``max_points`` points of ``(x, y)``."""
+    if method == "lttb":
+        return lttb(x, y, max_points)
+    if method == "minmax":
+        return minmax(x, y, max(1, (max_points - 2) // 2))
+    raise ValueError(f"Unknown downsampling method: {method!r}")
+
+
+def axes_width_px(ax):
+    """Width of ``ax`` on its figure in pixels."""
+    fig = ax.figure
+    return fig.get_figwidth() * fig.dpi * ax.get_position().width
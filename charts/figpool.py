@@ -0,0 +1,194 @@
+"""Pool of reusable matplotlib figures.
+
+Building a ``Figure`` and its ``Axes`` costs about as much as drawing a small
+chart, so :class:`FigurePool` hands out pre-built figures with one axes,
+keyed by projection (``None`` for cartesian axes, ``"polar"`` for polar), and
+takes them back after use.  Figures are created with the object-oriented API
+(``Figure`` + ``FigureCanvasAgg``) and never registered with pyplot.
+
+On release only the artists added since the figure was acquired are removed
+and the axes state charts change (limits, aspect, ticks, colour cycle,
+layout) is restored from a snapshot taken when the figure was built, which
+is much cheaper than ``Axes.clear()``.  Figures whose axes picked up unit
+converters (e.g. categorical string data) cannot be restored that way and are
+discarded instead of being pooled.
+"""
+import threading
+from contextlib import contextmanager
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.transforms import Bbox
+
+DEFAULT_MAXSIZE = 4
+
+
+_DEFAULT_FLAGS = ("isDefault_majloc", "isDefault_minloc", "isDefault_majfmt", "isDefault_minfmt")
+
+
+def _axis_state(axis):
+    return (
+        axis.get_major_locator(),
+        axis.get_minor_locator(),
+        axis.get_major_formatter(),
+        axis.get_minor_formatter(),
+        axis.get_visible(),
+        [getattr(axis, flag) for flag in _DEFAULT_FLAGS],
+    )
+
+
+def _restore_axis(axis, state):
+    major_locator, minor_locator, major_formatter, minor_formatter, visible, flags = state
+    axis.set_major_locator(major_locator)
+    axis.set_minor_locator(minor_locator)
+    axis.set_major_formatter(major_formatter)
+    axis.set_minor_formatter(minor_formatter)
+    axis.set_visible(visible)
+    # The setters above mark the locators/formatters as user-set, which would
+    # stop e.g. categorical data from installing its own.
+    for flag, value in zip(_DEFAULT_FLAGS, flags):
+        setattr(axis, flag, value)
+
+
+class _Snapshot:
+    """State of a freshly built figure that charts are allowed to change."""
+
+    def __init__(self, fig):
+        ax = fig.axes[0]
+        self.subplotspec = ax.get_subplotspec()
+        self.position = ax.get_position(original=True)
+        self.active_position = ax.get_position()
+        self.xlim = ax.get_xlim()
+        self.ylim = ax.get_ylim()
+        self.margins = ax.margins()
+        self.autoscale = (ax.get_autoscalex_on(), ax.get_autoscaley_on())
+        self.tight = ax._tight
+        self.aspect = ax.get_aspect()
+        self.adjustable = ax.get_adjustable()
+        self.anchor = ax.get_anchor()
+        self.frame_on = ax.get_frame_on()
+        self.axison = ax.axison
+        self.axis_states = [_axis_state(axis) for axis in ax._axis_map.values()]
+        self.title_texts = [(t, t.get_text()) for t in (ax.title, ax._left_title, ax._right_title)]
+
+
+def new_figure(projection=None, **figure_kwargs):
+    """Return a new ``Figure`` with an Agg canvas and one axes of ``projection``.
+
+    The figure is not registered with pyplot, so it needs no closing and can
+    be drawn and rendered from any thread.
+    """
+    fig = Figure(**figure_kwargs)
+    FigureCanvasAgg(fig)
+    fig.add_subplot(projection=projection)
+    return fig
+
+
+def _reusable(fig):
+    ax = fig.axes[0]
+    return all(axis.units is None and axis.get_converter() is None
+               for axis in ax._axis_map.values())
+
+
+def _reset(fig, snapshot):
+    ax = fig.axes[0]
+    # Extra axes, e.g. a colorbar, and figure-level artists.
+    for extra in fig.axes[1:]:
+        extra.remove()
+    for artist in [*fig.legends, *fig.texts, *fig.images, *fig.patches, *fig.lines]:
+        artist.remove()
+    fig._suptitle = fig._supxlabel = fig._supylabel = None
+    # Plugins connected for the mpld3 export, e.g. by charts.zoom.
+    fig.__dict__.pop("mpld3_plugins", None)
+
+    for artist in list(ax._children):
+        artist.remove()
+    ax.containers.clear()
+    ax.child_axes.clear()
+    if ax.legend_ is not None:
+        ax.legend_.remove()
+    for text, value in snapshot.title_texts:
+        text.set_text(value)
+
+    ax.set_subplotspec(snapshot.subplotspec)
+    ax._set_position(snapshot.position, which="original")
+    ax._set_position(snapshot.active_position, which="active")
+    ax.set_aspect(snapshot.aspect, adjustable=snapshot.adjustable, anchor=snapshot.anchor)
+    ax.set_frame_on(snapshot.frame_on)
+    ax.axison = snapshot.axison
+    for axis, state in zip(ax._axis_map.values(), snapshot.axis_states):
+        _restore_axis(axis, state)
+    ax.set_prop_cycle(None)
+
+    ax.dataLim.set_points(Bbox.null().get_points())
+    ax.ignore_existing_data_limits = True
+    ax.set_xlim(snapshot.xlim, auto=None)
+    ax.set_ylim(snapshot.ylim, auto=None)
+    ax.margins(*snapshot.margins, tight=None)
+    ax._tight = snapshot.tight
+    ax.use_sticky_edges = True
+    ax.set_autoscalex_on(snapshot.autoscale[0])
+    ax.set_autoscaley_on(snapshot.autoscale[1])
+    fig.stale = True
+
+
+class FigurePool:
+    """Thread-safe pool of at most ``maxsize`` idle figures per projection."""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, **figure_kwargs):
+        self.maxsize = maxsize
+        self.figure_kwargs = figure_kwargs
+        self.hits = 0
+        self.misses = 0
+        self._free = {}
+        self._snapshots = {}
+        self._projections = {}
+        self._lock = threading.Lock()
+
+    def _build(self, projection):
+        fig = new_figure(projection, **self.figure_kwargs)
+        self._snapshots[fig] = _Snapshot(fig)
+        self._projections[fig] = projection
+        return fig
+
+    def acquire(self, projection=None):
+        """Return a figure with a single empty axes of ``projection``."""
+        with self._lock:
+            free = self._free.get(projection)
+            if free:
+                self.hits += 1
+                return free.pop()
+            self.misses += 1
+            return self._build(projection)
+
+    def release(self, fig):
+        """Return ``fig`` to the pool, clearing what was drawn on it."""
+        with self._lock:
+            projection = self._projections.get(fig)
+            free = self._free.setdefault(projection, [])
+            if fig not in self._snapshots or len(free) >= self.maxsize or not _reusable(fig):
+                self._discard(fig)
+                return
+        _reset(fig, self._snapshots[fig])
+        with self._lock:
+            free.append(fig)
+
+    def _discard(self, fig):
+        self._snapshots.pop(fig, None)
+        self._projections.pop(fig, None)
+
+    @contextmanager
+    def figure(self, projection=None):
+        """Context manager acquiring a figure and releasing it on exit."""
+        fig = self.acquire(projection)
+        try:
+            yield fig
+        finally:
+            self.release(fig)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+
+# Pool shared by the chart builders of this process.
+default_pool = FigurePool()
@@ -1,197 +1,569 @@
 import os
-import json
+import sys
+import time
+import argparse
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+if __package__ in (None, ""):
+    # Allow ``python charts/generate.py`` from the repository root.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import numpy as np
-import matplotlib.pyplot as plt
-import mpld3
 
-# Create output directories
+# None of these import matplotlib, so --help and the parent process of a
+# parallel run never do.  The chart builders (via ``registry.CHART_REGISTRY``),
+# the figure pool, the cache and mpld3 are imported when first needed.
+from charts import assets, bundle, instrument, jsonstream, raster as rasters, registry, sidecar
+from charts.render import STATIC_FORMATS, save_formats
+from charts.downsample import METHODS as DOWNSAMPLE_METHODS, axes_width_px, reduce_points
+from charts.pyramid import build_levels
+from charts.registry import DEFAULT_SEED, iter_jobs, job_rng, load_size_config, parse_sizes
+
+# Default output directories
 output_dir = "output"
 data_dir = "test_data"
-os.makedirs(output_dir, exist_ok=True)
-os.makedirs(data_dir, exist_ok=True)
+
+DATA_FORMATS = ("json", "binary")
+CHART_FORMATS = ("html", *STATIC_FORMATS)
+
+Result = namedtuple("Result", ["job", "html_path", "chart_paths", "data_paths", "digest",
+                               "cached", "stats"])
+
+# Manifest of the previous run, set per process by ``iter_generate``/``_init_worker``
+_cache = None
+
+
+def _max_points(ax, points_per_pixel):
+    return max(3, int(points_per_pixel * axes_width_px(ax)))
+
+
+def _reduction_record(method, points_per_pixel, n, indices, **extra):
+    return {
+        "reduction": {
+            "method": method,
+            "points_per_pixel": points_per_pixel,
+            "original_points": n,
+            "exported_points": len(indices),
+            **extra,
+        },
+        "exported_indices": indices,
+    }
+
+
+def _reduce_for_export(spec, data_dict, ax, method, points_per_pixel):
+    """Downsample the line data of ``spec`` to the pixel width of ``ax``.
+
+    Returns the data to draw and the entries recording the reduction for the
+    test data, which keeps the full-resolution arrays.
+    """
+    x_key, y_key = spec.downsample_keys
+    max_points = _max_points(ax, points_per_pixel)
+    n = len(data_dict[x_key])
+    if n <= max_points:
+        return data_dict, {}
+    indices = reduce_points(data_dict[x_key], data_dict[y_key], max_points, method)
+    draw_data = {**data_dict, x_key: data_dict[x_key][indices], y_key: data_dict[y_key][indices]}
+    return draw_data, _reduction_record(method, points_per_pixel, n, indices)
+
+
+def _pyramid_for_export(spec, data_dict, ax, points_per_pixel):
+    """Build the zoom pyramid of ``spec`` for the pixel width of ``ax``.
+
+    Like :func:`_reduce_for_export`, but the chart is drawn from the coarsest
+    level and the levels are returned too (``None`` when the data already
+    fits the axes) so the figure can carry them for zooming.
+    """
+    kind, x_key, y_key = spec.pyramid
+    max_points = _max_points(ax, points_per_pixel)
+    x, y = data_dict[x_key], data_dict[y_key]
+    n = len(x)
+    if n <= max_points:
+        return data_dict, {}, None
+    levels = build_levels(x, y, kind, max_points)
+    coarse = levels[0].astype(np.intp)
+    draw_data = {**data_dict, x_key: x[coarse], y_key: y[coarse]}
+    record = _reduction_record("pyramid", points_per_pixel, n, coarse,
+                               budget=max_points, levels=[len(level) for level in levels])
+    return draw_data, record, levels
+
+
+def _raster_for_export(spec, data_dict, data_stem, fmt, dtype, tile_size):
+    """Quantize the matrix of ``spec`` once and write it as an image.
+
+    Returns the data to draw and the ``"raster"`` entry describing the image
+    (and tiles) for the test data.
+    """
+    key, cmap = spec.raster
+    matrix = data_dict[key]
+    vmin, vmax = float(np.nanmin(matrix)), float(np.nanmax(matrix))
+    image = rasters.quantize(matrix, cmap, vmin, vmax)
+    rasters.write_image(image, f"{data_stem}.{fmt}", fmt)
+    info = {
+        "key": key,
+        "image": os.path.basename(f"{data_stem}.{fmt}"),
+        "format": fmt,
+        "cmap": cmap,
+        "vmin": vmin,
+        "vmax": vmax,
+        "shape": list(matrix.shape),
+        "dtype": rasters.DTYPES[dtype],
+        "tiles": rasters.write_tiles(image, data_stem, fmt, tile_size) if tile_size else None,
+    }
+    draw_data = {**data_dict, "image": image, "cmap": cmap, "vmin": vmin, "vmax": vmax}
+    return draw_data, {"raster": info}
+
+
+def _source_modules(spec, formats=("html",), data_formats=("json",), downsample=None,
+                    pyramid=False, raster=None, scatter_canvas=0, **options):
+    """Return the modules whose source decides the outputs of ``spec`` when
+    saved with these :func:`save_chart_and_data` options.
+
+    Those are the helpers its builder declared, the figure pool, and the
+    export and test data modules the options actually use for this chart.
+    """
+    modules = [*spec.modules, "charts.figpool"]
+    if set(formats) - {"html"}:
+        modules.append("charts.render")
+    if raster and spec.raster:
+        modules.append("charts.raster")
+    elif pyramid and spec.pyramid:
+        modules += ["charts.downsample", "charts.pyramid", "charts.zoom", "charts.pagedata"]
+    elif downsample and spec.downsample_keys:
+        modules.append("charts.downsample")
+    if scatter_canvas and spec.canvas:
+        modules += ["charts.canvas", "charts.pagedata"]
+    if "json" in data_formats:
+        modules.append("charts.jsonstream")
+    if "binary" in data_formats or (raster and spec.raster):
+        modules.append("charts.sidecar")
+    return tuple(sorted(set(modules)))
+
+
+def _chart_paths(chart_name, version, formats, output_dir):
+    return {fmt: os.path.join(output_dir, f"{chart_name}_{version}.{fmt}") for fmt in formats}
+
 
 # Helper function to save chart and data
-def save_chart_and_data(fig, chart_name, version, data_dict):
-    # Save HTML chart
-    html_path = os.path.join(output_dir, f"{chart_name}_{version}.html")
-    mpld3.save_html(fig, html_path)
-    plt.close(fig)
-    
-    # Save test data
-    data_path = os.path.join(data_dir, f"{chart_name}_{version}.json")
-    with open(data_path, 'w') as f:
-        json.dump(data_dict, f, indent=2)
-
-# 1. Line Chart
-for i in [1, 2]:
-    fig, ax = plt.subplots()
-    x = np.linspace(0, 10, 10 if i == 1 else 100)
-    y = np.sin(x)
-    ax.plot(x, y, label="sin(x)")
-    ax.set_title("Line Chart")
-    save_chart_and_data(fig, "line_chart", i, {
-        "chart_type": "line_chart",
-        "version": i,
-        "x": x.tolist(),
-        "y": y.tolist()
-    })
-
-# 2. Bar Chart
-for i in [1, 2]:
-    fig, ax = plt.subplots()
-    x = np.arange(5 if i == 1 else 20)
-    y = np.random.randint(1, 10, len(x))
-    ax.bar(x, y)
-    ax.set_title("Bar Chart")
-    save_chart_and_data(fig, "bar_chart", i, {
-        "chart_type": "bar_chart",
-        "version": i,
-        "x": x.tolist(),
-        "y": y.tolist()
-    })
-
-# 3. Horizontal Bar Chart
-for i in [1, 2]:
-    fig, ax = plt.subplots()
-    x = np.arange(5 if i == 1 else 20)
-    y = np.random.randint(1, 10, len(x))
-    ax.barh(x, y)
-    ax.set_title("Horizontal Bar Chart")
-    save_chart_and_data(fig, "horizontal_bar_chart", i, {
-        "chart_type": "horizontal_bar_chart",
-        "version": i,
-        "x": x.tolist(),
-        "y": y.tolist()
-    })
-
-# 4. Pie Chart
-for i in [1, 2]:
-    fig, ax = plt.subplots()
-    data = np.random.randint(1, 10, 4 if i == 1 else 8)
-    labels = [f"Slice {j}" for j in range(len(data))]
-    ax.pie(data, labels=labels)
-    ax.set_title("Pie Chart")
-    save_chart_and_data(fig, "pie_chart", i, {
-        "chart_type": "pie_chart",
-        "version": i,
-        "data": data.tolist(),
-        "labels": labels
-    })
-
-# 5. Scatter Plot
-for i in [1, 2]:
-    fig, ax = plt.subplots()
-    x = np.random.rand(10 if i == 1 else 100)
-    y = np.random.rand(10 if i == 1 else 100)
-    ax.scatter(x, y)
-    ax.set_title("Scatter Plot")
-    save_chart_and_data(fig, "scatter_plot", i, {
-        "chart_type": "scatter_plot",
-        "version": i,
-        "x": x.tolist(),
-        "y": y.tolist()
-    })
-
-# 6. Histogram
-for i in [1, 2]:
-    fig, ax = plt.subplots()
-    data = np.random.randn(100 if i == 1 else 1000)
-    counts, bins = np.histogram(data, bins=10)
-    ax.hist(data, bins=10)
-    ax.set_title("Histogram")
-    save_chart_and_data(fig, "histogram", i, {
-        "chart_type": "histogram",
-        "version": i,
-        "data": data.tolist(),
-        "counts": counts.tolist(),
-        "bins": bins.tolist()
-    })
-
-# 7. Box Plot
-for i in [1, 2]:
-    fig, ax = plt.subplots()
-    data = [np.random.randn(10 if i == 1 else 100) for _ in range(4)]
-    ax.boxplot(data)
-    ax.set_title("Box Plot")
-    save_chart_and_data(fig, "box_plot", i, {
-        "chart_type": "box_plot",
-        "version": i,
-        "data": [d.tolist() for d in data]
-    })
-
-# 8. Area Chart
-for i in [1, 2]:
-    fig, ax = plt.subplots()
-    x = np.linspace(0, 10, 10 if i == 1 else 100)
-    y = np.abs(np.sin(x))
-    ax.fill_between(x, y, alpha=0.5)
-    ax.set_title("Area Chart")
-    save_chart_and_data(fig, "area_chart", i, {
-        "chart_type": "area_chart",
-        "version": i,
-        "x": x.tolist(),
-        "y": y.tolist()
-    })
-
-# 9. Stem Plot
-for i in [1, 2]:
-    fig, ax = plt.subplots()
-    x = np.arange(10 if i == 1 else 50)
-    y = np.random.rand(len(x))
-    ax.stem(x, y)
-    ax.set_title("Stem Plot")
-    save_chart_and_data(fig, "stem_plot", i, {
-        "chart_type": "stem_plot",
-        "version": i,
-        "x": x.tolist(),
-        "y": y.tolist()
-    })
-
-# 10. Heatmap
-for i in [1, 2]:
-    fig, ax = plt.subplots()
-    data = np.random.rand(5 if i == 1 else 20, 5 if i == 1 else 20)
-    cax = ax.imshow(data, cmap="viridis")
-    fig.colorbar(cax)
-    ax.set_title("Heatmap")
-    save_chart_and_data(fig, "heatmap", i, {
-        "chart_type": "heatmap",
-        "version": i,
-        "data": data.tolist()
-    })
-
-# 11. Stacked Bar Chart
-for i in [1, 2]:
-    fig, ax = plt.subplots()
-    x = np.arange(5 if i == 1 else 20)
-    y1 = np.random.randint(1, 5, size=len(x))
-    y2 = np.random.randint(1, 5, size=len(x))
-    ax.bar(x, y1, label="A")
-    ax.bar(x, y2, bottom=y1, label="B")
-    ax.legend()
-    ax.set_title("Stacked Bar Chart")
-    save_chart_and_data(fig, "stacked_bar_chart", i, {
-        "chart_type": "stacked_bar_chart",
-        "version": i,
-        "x": x.tolist(),
-        "y1": y1.tolist(),
-        "y2": y2.tolist()
-    })
-
-# 12. Polar Plot
-for i in [1, 2]:
-    fig = plt.figure()
-    ax = fig.add_subplot(111, polar=True)
-    theta = np.linspace(0, 2 * np.pi, 10 if i == 1 else 100)
-    r = np.abs(np.sin(theta) * (1 + 0.1 * np.random.randn(len(theta))))
-    ax.plot(theta, r)
-    ax.set_title("Polar Plot")
-    save_chart_and_data(fig, "polar_plot", i, {
-        "chart_type": "polar_plot",
-        "version": i,
-        "theta": theta.tolist(),
-        "r": r.tolist()
-    })
-
-print(f"All charts have been saved in the '{output_dir}' folder.")
-print(f"All test data has been saved in the '{data_dir}' folder.")
\ No newline at end of file
+def save_chart_and_data(spec, version, data_dict, output_dir=output_dir,
+                        data_dir=data_dir, cache=None, json_indent=2,
+                        data_formats=("json",), pool=None,
+                        downsample=None, points_per_pixel=2.0, pyramid=False,
+                        raster=None, raster_dtype="float32", raster_tiles=0,
+                        scatter_canvas=0, formats=("html",), asset_urls=None,
+                        stages=instrument.DISABLED):
+    """Draw ``spec`` from ``data_dict`` and save the chart and test data.
+
+    The figure is drawn once and saved as each of ``formats``: ``"html"``
+    (mpld3) and/or the :data:`~charts.render.STATIC_FORMATS`, all to
+    ``<chart>_<version>.<format>`` in ``output_dir``.  Static files show the
+    figure as drawn for the HTML (downsampled, say) but without any mpld3
+    plugin.  ``asset_urls`` are the ``d3_url``/``mpld3_url`` of the page
+    (default: the CDN copies), see :mod:`charts.assets`.
+
+    Returns ``(chart_paths, data_paths, digest, cached, timings)`` where
+    ``chart_paths`` maps each format to its file and ``timings`` to the
+    seconds spent on it.  When ``cache`` says the outputs were already
+    built from the same data, source and library versions, nothing is drawn
+    or written, ``cached`` is true and ``timings`` is empty.
+
+    ``data_formats`` selects the test data files: ``"json"`` streams the data
+    to ``<chart>_<version>.json`` with ``json_indent`` (``None`` for compact
+    JSON), ``"binary"`` writes a :mod:`charts.sidecar` header and blob.
+    The figure is borrowed from ``pool`` (default: the
+    :data:`~charts.figpool.default_pool`) and returned to it afterwards.
+
+    With ``downsample`` set to a :mod:`charts.downsample` method, line-like
+    charts with more than ``points_per_pixel`` points per pixel of axes width
+    are reduced before drawing; the test data keeps every point and records
+    the reduction and the exported indices.  With ``pyramid``, line, area
+    and scatter charts are instead exported with a :mod:`charts.pyramid` and
+    a :mod:`charts.zoom` plugin that shows more detail as the chart is zoomed.
+
+    With ``raster`` set to an image format, heatmaps are exported as a
+    :mod:`charts.raster` image (plus ``raster_tiles``-pixel tiles unless 0)
+    and their matrix is only written to the binary sidecar, as
+    ``raster_dtype``.  Scatter plots with more than ``scatter_canvas`` points
+    (unless 0) are drawn by a :mod:`charts.canvas` plugin instead of as SVG.
+
+    Each stage (hashing, drawing, the static formats, the HTML and each test
+    data format) is recorded by ``stages``, a :class:`charts.instrument.Profile`.
+    """
+    chart_name = spec.chart_type
+    chart_paths = _chart_paths(chart_name, version, formats, output_dir)
+    data_stem = os.path.join(data_dir, f"{chart_name}_{version}")
+    data_paths = []
+    if "json" in data_formats:
+        data_paths.append(f"{data_stem}.json")
+    raster_key = spec.raster[0] if raster and spec.raster else None
+    if "binary" in data_formats or raster_key:
+        data_paths.extend(sidecar.sidecar_paths(data_stem))
+    if raster_key:
+        data_paths.append(f"{data_stem}.{raster}")
+        if raster_tiles:
+            data_paths.extend(rasters.tile_paths(data_stem, np.shape(data_dict[raster_key]),
+                                                 raster, raster_tiles))
+    from charts.cache import content_hash
+
+    with stages.stage("hash"):
+        digest = content_hash(data_dict, spec.make_data, spec.draw,
+                              options={"json_indent": json_indent,
+                                       "data_formats": sorted(data_formats),
+                                       "downsample": downsample,
+                                       "points_per_pixel": points_per_pixel,
+                                       "pyramid": pyramid,
+                                       "raster": [raster, raster_dtype, raster_tiles],
+                                       "scatter_canvas": scatter_canvas,
+                                       "formats": sorted(formats),
+                                       "asset_urls": asset_urls},
+                              modules=_source_modules(spec, formats, data_formats, downsample,
+                                                      pyramid, raster, scatter_canvas))
+    files = [*chart_paths.values(), *data_paths]
+    if cache is not None and cache.is_fresh(f"{chart_name}_{version}", digest, files):
+        return chart_paths, data_paths, digest, True, {}
+
+    if pool is None:
+        from charts.figpool import default_pool as pool
+
+    # Save the chart in every format from the same figure
+    with pool.figure(spec.projection) as fig:
+        with stages.stage("draw"):
+            draw_data, levels = data_dict, None
+            if raster_key:
+                draw_data, record = _raster_for_export(spec, data_dict, data_stem, raster,
+                                                       raster_dtype, raster_tiles)
+                data_dict = {**data_dict, **record}
+            elif pyramid and spec.pyramid:
+                draw_data, record, levels = _pyramid_for_export(spec, data_dict, fig.axes[0],
+                                                                points_per_pixel)
+                data_dict = {**data_dict, **record}
+            elif downsample and spec.downsample_keys:
+                draw_data, record = _reduce_for_export(spec, data_dict, fig.axes[0],
+                                                       downsample, points_per_pixel)
+                data_dict = {**data_dict, **record}
+            spec.draw(fig.axes[0], draw_data)
+        # Before any plugin, as the canvas plugin removes the scatter points.
+        static_paths = {fmt: path for fmt, path in chart_paths.items() if fmt != "html"}
+        timings = {}
+        if static_paths:
+            with stages.stage("static"):
+                timings = save_formats(fig, static_paths)
+        if "html" in chart_paths:
+            with stages.stage("html"):
+                start = time.perf_counter()
+                plugin = None
+                if levels is not None:
+                    from charts import zoom
+                    kind, x_key, y_key = spec.pyramid
+                    plugin = zoom.attach(fig, kind, data_dict[x_key], data_dict[y_key], levels,
+                                         data_dict["reduction"]["budget"])
+                elif (scatter_canvas and spec.canvas
+                        and len(draw_data[spec.canvas[0]]) > scatter_canvas):
+                    from charts import canvas
+                    x_key, y_key = spec.canvas
+                    plugin = canvas.attach(fig, draw_data[x_key], draw_data[y_key])
+                    data_dict = {**data_dict, "canvas": {"points": len(draw_data[x_key])}}
+
+                # mpld3 imports pyplot, so only load it once a chart is actually exported.
+                import mpld3
+
+                with open(chart_paths["html"], "w") as f:
+                    if plugin is not None:
+                        f.write(plugin.data_script())
+                    f.write(mpld3.fig_to_html(fig, **(asset_urls or {})))
+                timings["html"] = time.perf_counter() - start
+
+    # Save test data; a rasterized matrix only goes to the binary sidecar.
+    if "json" in data_formats:
+        json_data = data_dict
+        if raster_key:
+            json_data = {k: v for k, v in data_dict.items() if k != raster_key}
+        with stages.stage("json"), open(f"{data_stem}.json", 'w') as f:
+            jsonstream.dump(json_data, f, indent=json_indent)
+    if "binary" in data_formats or raster_key:
+        dtypes = {raster_key: rasters.DTYPES[raster_dtype]} if raster_key else None
+        with stages.stage("sidecar"):
+            sidecar.write(data_dict, data_stem, dtypes=dtypes)
+    return chart_paths, data_paths, digest, False, timings
+
+
+def run_job(job, seed=DEFAULT_SEED, profile=False, changed_only=False, **save_options):
+    """Build a single chart and save its HTML and test data.
+
+    ``save_options`` are passed on to :func:`save_chart_and_data`.  Returns
+    its result plus a dict of per-job stats, including the seconds spent
+    writing each chart format, the :func:`~charts.cache.dependency_key` of
+    the chart (``"deps"``) and, with ``profile``, the
+    :mod:`charts.instrument` records of every stage.
+
+    With ``changed_only``, a chart whose dependency key matches the manifest
+    is skipped before its data is made: the result is the manifest's and
+    ``stats["skipped"]`` is true.
+    """
+    from charts.cache import dependency_key
+    from charts.figpool import default_pool
+
+    spec = registry.CHART_REGISTRY[job.chart_type]
+    key = f"{job.chart_type}_{job.version}"
+    deps = dependency_key((spec.make_data, spec.draw), job.size, seed, options=save_options,
+                          modules=_source_modules(spec, **save_options))
+    if changed_only and _cache is not None and _cache.is_unchanged(key, deps):
+        entry = _cache.entries[key]
+        chart_paths = _chart_paths(job.chart_type, job.version,
+                                   save_options.get("formats", ("html",)),
+                                   save_options.get("output_dir", output_dir))
+        data_paths = [p for p in entry["files"] if p not in chart_paths.values()]
+        stats = {"pool_hits": 0, "pool_misses": 0, "format_seconds": {}, "stages": [],
+                 "deps": deps, "skipped": True}
+        return chart_paths, data_paths, entry["hash"], True, stats
+
+    stages = (instrument.Profile(f"{job.chart_type}_{job.version}") if profile
+              else instrument.DISABLED)
+    with stages.stage("data"):
+        data = spec.make_data(job.size, job_rng(job, seed))
+    data_dict = {"chart_type": job.chart_type, "version": job.version, **data}
+    hits, misses = default_pool.hits, default_pool.misses
+    *saved, timings = save_chart_and_data(spec, job.version, data_dict, cache=_cache,
+                                          stages=stages, **save_options)
+    stats = {
+        "pool_hits": default_pool.hits - hits,
+        "pool_misses": default_pool.misses - misses,
+        "format_seconds": timings,
+        "stages": list(stages.records),
+        "deps": deps,
+        "skipped": False,
+    }
+    return (*saved, stats)
+
+
+def _init_worker(cache):
+    # Workers select the Agg backend exactly once, here, rather than per
+    # chart; figures then come from the worker's own figure pool.
+    import matplotlib
+    matplotlib.use("Agg")
+
+    global _cache
+    _cache = cache
+
+
+def _bounded_map(executor, fn, iterable, window):
+    # Like ``executor.map`` but only keeps ``window`` jobs in flight, so a
+    # lazily enumerated sweep is never materialised all at once.
+    pending = deque()
+    for item in iterable:
+        pending.append((item, executor.submit(fn, item)))
+        if len(pending) >= window:
+            job, future = pending.popleft()
+            yield job, future.result()
+    while pending:
+        job, future = pending.popleft()
+        yield job, future.result()
+
+
+def _run_all(jobs, task, workers, cache):
+    global _cache
+    if workers <= 1:
+        _cache = cache
+        for job in jobs:
+            yield job, task(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(cache,)) as executor:
+        yield from _bounded_map(executor, task, jobs, window=4 * workers)
+
+
+def iter_generate(jobs, workers=1, output_dir=output_dir, data_dir=data_dir, use_cache=True,
+                  seed=DEFAULT_SEED, local_assets=True, bundle_size=0, profile=False,
+                  changed_only=False, **save_options):
+    """Run ``jobs`` across ``workers`` processes, yielding results lazily.
+
+    Results are :class:`Result` tuples in the same order as ``jobs``,
+    regardless of which worker finished first.  Unless ``use_cache`` is
+    false, charts whose inputs are unchanged since the last run are not
+    re-rendered, and the manifest in ``output_dir`` is updated at the end.
+    Random data is derived from ``seed`` per job, so the test data is the
+    same for any number of workers.  With ``local_assets``, the pages load
+    d3 and mpld3 from one copy in ``output_dir/assets`` rather than from
+    their CDNs.  With ``bundle_size``, the HTML charts are also collected into
+    :mod:`charts.bundle` pages of that many figures once every job is done.
+    With ``profile``, each result's ``stats["stages"]`` holds the
+    :mod:`charts.instrument` records of the chart.  With ``changed_only``,
+    charts whose builder source, size, seed and options are unchanged since
+    the last run are skipped without making their data (see :func:`run_job`).
+    Other keyword arguments
+    are passed on to :func:`save_chart_and_data`.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    os.makedirs(data_dir, exist_ok=True)
+    if local_assets and "html" in save_options.get("formats", ("html",)):
+        save_options["asset_urls"] = assets.install(output_dir)
+    task = partial(run_job, seed=seed, profile=profile, changed_only=changed_only,
+                   output_dir=output_dir, data_dir=data_dir, **save_options)
+    from charts.cache import OutputCache
+
+    cache = OutputCache.load(output_dir) if use_cache else None
+    try:
+        yield from _collect(_run_all(jobs, task, workers, cache), cache, output_dir,
+                            bundle_size, save_options.get("asset_urls"))
+    finally:
+        if cache is not None:
+            cache.evict(registry.CHART_REGISTRY)
+            cache.save()
+
+
+def _collect(results, cache, output_dir, bundle_size, asset_urls):
+    # Record the ``(job, run_job result)`` pairs of a run in ``cache`` and
+    # yield them as Results, then write the bundles of their HTML pages.
+    pages = []
+    for job, (chart_paths, data_paths, digest, cached, stats) in results:
+        if cache is not None:
+            cache.record(f"{job.chart_type}_{job.version}", job.chart_type,
+                         digest, [*chart_paths.values(), *data_paths], deps=stats["deps"])
+        if bundle_size and "html" in chart_paths:
+            pages.append((job, chart_paths["html"]))
+        yield Result(job, chart_paths.get("html"), chart_paths, data_paths, digest,
+                     cached, stats)
+    if pages:
+        bundle.write_bundles(pages, output_dir, bundle_size, asset_urls)
+
+
+def generate(jobs, **kwargs):
+    """Run ``jobs`` and return the list of results from :func:`iter_generate`."""
+    return list(iter_generate(jobs, **kwargs))
+
+
+def _parse_data_formats(value):
+    formats = tuple(value.split(","))
+    unknown = set(formats) - set(DATA_FORMATS)
+    if unknown or not formats:
+        raise argparse.ArgumentTypeError(f"unknown data format(s): {', '.join(sorted(unknown))}")
+    return formats
+
+
+def _parse_formats(value):
+    formats = tuple(dict.fromkeys(value.split(",")))
+    unknown = set(formats) - set(CHART_FORMATS)
+    if unknown or not formats:
+        raise argparse.ArgumentTypeError(f"unknown chart format(s): {', '.join(sorted(unknown))}")
+    return formats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate mpld3 charts and their test data.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument("--charts", type=lambda s: s.split(","), default=None,
+                        help="comma separated chart types to generate (default: all)")
+    parser.add_argument("--sizes", action="append", metavar="[CHART=]N,N,...",
+                        help="sizes to generate, one version per size; repeat per chart type")
+    parser.add_argument("--config", help="JSON file mapping chart types to lists of sizes")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED,
+                        help=f"master seed for the random chart data (default: {DEFAULT_SEED})")
+    parser.add_argument("--no-cache", dest="use_cache", action="store_false",
+                        help="re-render every chart even if its inputs are unchanged")
+    parser.add_argument("--changed-only", action="store_true",
+                        help="skip charts whose builder source, size, seed and options are "
+                             "unchanged without making their data, and list them")
+    parser.add_argument("--compact-json", dest="json_indent", action="store_const",
+                        const=None, default=2, help="write test data without indentation")
+    parser.add_argument("--formats", type=_parse_formats, default=("html",),
+                        metavar=",".join(CHART_FORMATS),
+                        help="chart formats to write from each figure (default: html)")
+    parser.add_argument("--data-formats", type=_parse_data_formats, default=("json",),
+                        metavar="json,binary",
+                        help="test data formats to write (default: json)")
+    parser.add_argument("--downsample", choices=DOWNSAMPLE_METHODS,
+                        help="reduce line, area and polar data before HTML export")
+    parser.add_argument("--points-per-pixel", type=float, default=2.0,
+                        help="points exported per pixel of axes width when downsampling")
+    parser.add_argument("--pyramid", action="store_true",
+                        help="embed a zoom-aware detail pyramid in line, area and scatter charts")
+    parser.add_argument("--heatmap-raster", dest="raster", choices=rasters.IMAGE_FORMATS,
+                        help="export heatmaps as a quantized image plus a binary matrix")
+    parser.add_argument("--raster-dtype", choices=sorted(rasters.DTYPES), default="float32",
+                        help="element type of the rasterized matrix (default: float32)")
+    parser.add_argument("--raster-tiles", type=int, default=0, metavar="PIXELS",
+                        help=f"also write a tile pyramid with tiles of this size "
+                             f"(e.g. {rasters.DEFAULT_TILE_SIZE})")
+    parser.add_argument("--scatter-canvas", type=int, default=0, metavar="POINTS",
+                        help="draw scatter plots with more points than this on a canvas")
+    parser.add_argument("--cdn-assets", dest="local_assets", action="store_false",
+                        help="load d3 and mpld3 from their CDNs instead of output/assets")
+    parser.add_argument("--bundle", dest="bundle_size", type=int, default=0, metavar="N",
+                        help="also write bundle pages holding N chart figures each")
+    parser.add_argument("--profile", metavar="DIR",
+                        help="record time and memory of every chart stage and write "
+                             "stages.json, stages.csv and trace.json (Chrome trace) to DIR")
+    parser.add_argument("--output-dir", default=output_dir)
+    parser.add_argument("--data-dir", default=data_dir)
+    return parser.parse_args(argv)
+
+
+def _jobs(args):
+    sizes = load_size_config(args.config) if args.config else {}
+    sizes.update(parse_sizes(args.sizes))
+    return iter_jobs(args.charts, sizes)
+
+
+def _save_options(args):
+    # The save_chart_and_data options of the parsed command line.
+    return dict(json_indent=args.json_indent, data_formats=args.data_formats,
+                downsample=args.downsample, points_per_pixel=args.points_per_pixel,
+                pyramid=args.pyramid, raster=args.raster, raster_dtype=args.raster_dtype,
+                raster_tiles=args.raster_tiles, scatter_canvas=args.scatter_canvas,
+                formats=args.formats)
+
+
+def _report(results, args):
+    """Consume ``results`` and return the lines summarizing the run."""
+    rendered = cached = pool_hits = pool_misses = 0
+    format_seconds = {}
+    stages = []
+    skipped = []
+    for result in results:
+        if result.stats["skipped"]:
+            skipped.append(f"{result.job.chart_type}_{result.job.version}")
+        cached += result.cached
+        rendered += not result.cached
+        pool_hits += result.stats["pool_hits"]
+        pool_misses += result.stats["pool_misses"]
+        for fmt, seconds in result.stats["format_seconds"].items():
+            format_seconds[fmt] = format_seconds.get(fmt, 0.0) + seconds
+        stages.extend(result.stats["stages"])
+
+    lines = [f"Rendered {rendered} charts, {cached} already up to date.",
+             f"Figure pool: {pool_hits} hits, {pool_misses} misses."]
+    if args.changed_only:
+        lines.append(f"Skipped {len(skipped)} unchanged charts"
+                     + (f": {', '.join(skipped)}" if skipped else "."))
+    if format_seconds:
+        lines.append("Time per format: " + ", ".join(f"{fmt} {seconds:.2f}s"
+                                                     for fmt, seconds in format_seconds.items()))
+    if args.profile:
+        instrument.write_reports(stages, args.profile)
+        lines.append(f"Stage profile saved in the '{args.profile}' folder:")
+        for stage, total in sorted(instrument.summarize(stages).items(),
+                                   key=lambda item: -item[1]["wall"]):
+            peak = total["peak_bytes"] / 2**20
+            lines.append(f"  {stage:>8}: {total['wall']:8.2f}s wall, {total['cpu']:8.2f}s CPU, "
+                         f"peak {peak:8.1f} MiB")
+    lines.append(f"All charts have been saved in the '{args.output_dir}' folder.")
+    lines.append(f"All test data has been saved in the '{args.data_dir}' folder.")
+    return lines
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = iter_generate(_jobs(args), workers=args.workers, output_dir=args.output_dir,
+                            data_dir=args.data_dir, use_cache=args.use_cache, seed=args.seed,
+                            local_assets=args.local_assets, bundle_size=args.bundle_size,
+                            profile=bool(args.profile), changed_only=args.changed_only,
+                            **_save_options(args))
+    for line in _report(results, args):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Per-stage timing and memory records of the chart generation pipeline.
+
+A :class:`Profile` times the stages of one chart (data synthesis, hashing,
+drawing, each output format, test data) as they run::
+
+    with profile.stage("draw"):
+        spec.draw(ax, data)
+
+Every stage records its wall time, CPU time of the process and, unless
+``memory`` is false, the peak memory allocated during the stage as traced
+by :mod:`tracemalloc` (which is started on first use and slows allocation
+heavy code down noticeably).  Stages must not be nested.
+
+:func:`write_reports` saves the records of a run as ``stages.json``,
+``stages.csv`` and a Chrome trace, ``trace.json``, which ``chrome://tracing``
+or Perfetto show as one row of stages per worker process.
+"""
+import csv
+import json
+import os
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+FIELDS = ("chart", "stage", "pid", "start", "wall", "cpu", "peak_bytes")
+
+
+class Profile:
+    """Stage records of the chart ``chart``."""
+
+    def __init__(self, chart, memory=True):
+        self.chart = chart
+        self.memory = memory
+        self.records = []
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name):
+        if self.memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - start, time.process_time() - cpu
+            peak = tracemalloc.get_traced_memory()[1] - base if self.memory else None
+            self.records.append({
+                "chart": self.chart,
+                "stage": name,
+                "pid": os.getpid(),
+                # perf_counter is system-wide on Linux, so workers share a timeline.
+                "start": start,
+                "wall": wall,
+                "cpu": cpu,
+                "peak_bytes": peak,
+            })
+
+
+class _Disabled:
+    """Stand-in for a :class:`Profile` when profiling is off."""
+
+    records = ()
+
+    def stage(self, name):
+        return nullcontext()
+
+
+DISABLED = _Disabled()
+
+
+def summarize(records):
+    """Return ``{stage: {"wall", "cpu", "peak_bytes"}}`` totals (peak: maximum)."""
+    totals = defaultdict(lambda: {"wall": 0.0, "cpu": 0.0, "peak_bytes": None})
+    for record in records:
+        total = totals[record["stage"]]
+        total["wall"] += record["wall"]
+        total["cpu"] += record["cpu"]
+        if record["peak_bytes"] is not None:
+            total["peak_bytes"] = max(total["peak_bytes"] or 0, record["peak_bytes"])
+    return dict(totals)
+
+
+def chrome_trace(records):
+    """Return ``records`` as a Chrome trace event dict."""
+    origin = min((r["start"] for r in records), default=0.0)
+    events = [
+        {
+            "name": r["stage"],
+            "cat": r["chart"],
+            "ph": "X",
+            "pid": r["pid"],
+            "tid": r["pid"],
+            "ts": (r["start"] - origin) * 1e6,
+            "dur": r["wall"] * 1e6,
+            "args": {"chart": r["chart"], "cpu_ms": r["cpu"] * 1e3,
+                     "peak_bytes": r["peak_bytes"]},
+        }
+        for r in records
+    ]
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_reports(records, directory):
+    """Write ``records`` to ``stages.json``, ``stages.csv`` and ``trace.json``."""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "stages.json"), "w") as f:
+        json.dump(list(records), f, indent=1)
+    with open(os.path.join(directory, "stages.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+    with open(os.path.join(directory, "trace.json"), "w") as f:
+        json.dump(chrome_trace(records), f)
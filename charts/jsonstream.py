@@ -0,0 +1,118 @@
+"""Streaming JSON writer for chart test data.
+
+:func:`dump` writes the same JSON as ``json.dump`` would for a dict holding
+``array.tolist()`` copies, but encodes NumPy arrays straight to the file a
+chunk at a time, so the full Python list of a large array is never built.
+With ``indent=None`` the output is compact, without any whitespace.
+"""
+import json
+import math
+
+import numpy as np
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+def _float_repr(value):
+    # Same spelling as the json module, including NaN/Infinity.
+    if math.isfinite(value):
+        return float.__repr__(value)
+    if value != value:
+        return "NaN"
+    return "Infinity" if value > 0 else "-Infinity"
+
+
+def _encode_items(chunk):
+    if chunk.dtype.kind == "f":
+        if np.isfinite(chunk).all():
+            return map(float.__repr__, chunk.tolist())
+        return map(_float_repr, chunk.tolist())
+    if chunk.dtype.kind in "iu":
+        return map(int.__repr__, chunk.tolist())
+    return map(json.dumps, chunk.tolist())
+
+
+class _Writer:
+    def __init__(self, fp, indent, chunk_size):
+        self.write = fp.write
+        self.indent = " " * indent if isinstance(indent, int) else indent
+        self.chunk_size = chunk_size
+        self.key_sep = ":" if indent is None else ": "
+
+    def _open(self, bracket, level):
+        # Returns the separator to put between items at ``level``.
+        if self.indent is None:
+            self.write(bracket)
+            return ","
+        newline = "\n" + self.indent * (level + 1)
+        self.write(bracket + newline)
+        return "," + newline
+
+    def _close(self, bracket, level):
+        if self.indent is not None:
+            self.write("\n" + self.indent * level)
+        self.write(bracket)
+
+    def value(self, value, level=0):
+        if isinstance(value, np.ndarray):
+            self.array(value, level)
+        elif isinstance(value, dict):
+            self.mapping(value, level)
+        elif isinstance(value, (list, tuple)):
+            self.sequence(value, level)
+        elif isinstance(value, np.generic):
+            self.value(value.item(), level)
+        else:
+            self.write(json.dumps(value))
+
+    def mapping(self, value, level):
+        if not value:
+            self.write("{}")
+            return
+        sep = self._open("{", level)
+        for i, (key, item) in enumerate(value.items()):
+            if i:
+                self.write(sep)
+            self.write(json.dumps(str(key)) + self.key_sep)
+            self.value(item, level + 1)
+        self._close("}", level)
+
+    def sequence(self, value, level):
+        if not value:
+            self.write("[]")
+            return
+        sep = self._open("[", level)
+        for i, item in enumerate(value):
+            if i:
+                self.write(sep)
+            self.value(item, level + 1)
+        self._close("]", level)
+
+    def array(self, value, level):
+        if value.ndim == 0:
+            self.value(value.item(), level)
+            return
+        if len(value) == 0:
+            self.write("[]")
+            return
+        sep = self._open("[", level)
+        if value.ndim > 1:
+            for i, row in enumerate(value):
+                if i:
+                    self.write(sep)
+                self.array(row, level + 1)
+        else:
+            for start in range(0, len(value), self.chunk_size):
+                if start:
+                    self.write(sep)
+                self.write(sep.join(_encode_items(value[start:start + self.chunk_size])))
+        self._close("]", level)
+
+
+def dump(obj, fp, indent=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write ``obj`` as JSON to the text file ``fp``.
+
+    ``obj`` may contain dicts, lists, tuples, scalars and NumPy arrays or
+    scalars.  Arrays are encoded ``chunk_size`` elements at a time.
+    """
+    _Writer(fp, indent, chunk_size).value(obj)
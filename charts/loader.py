@@ -0,0 +1,105 @@
+"""Load generated chart test data as NumPy arrays.
+
+:func:`load` opens the data of a chart by ``(chart_type, version)``.  When a
+binary sidecar (see :mod:`charts.sidecar`) exists its arrays are
+``np.memmap`` views, so large data is paged in on demand instead of read into
+memory; otherwise the JSON test data is parsed and its numeric lists are
+converted to arrays.  Opened data is kept in an LRU cache per loader.
+"""
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from charts import sidecar
+
+DEFAULT_DATA_DIR = "test_data"
+DEFAULT_MAXSIZE = 128
+
+
+def _to_array(value):
+    # Numeric (possibly nested) lists become arrays, ragged nested lists a list
+    # of arrays; anything else is returned unchanged.
+    if not isinstance(value, list) or not value:
+        return value
+    try:
+        array = np.asarray(value)
+    except ValueError:
+        array = None
+    if array is not None and array.dtype.kind in "biuf":
+        return array
+    if all(isinstance(v, list) for v in value):
+        items = [_to_array(v) if v else np.array([]) for v in value]
+        if all(isinstance(v, np.ndarray) for v in items):
+            return items
+    return value
+
+
+def _read_json(path):
+    with open(path) as f:
+        data = json.load(f)
+    return {key: _to_array(value) for key, value in data.items()}
+
+
+class ChartDataLoader:
+    """Open chart test data from ``data_dir``, keeping the ``maxsize`` most
+    recently used charts open.
+
+    An entry is reopened when its file changes on disk.
+    """
+
+    def __init__(self, data_dir=DEFAULT_DATA_DIR, maxsize=DEFAULT_MAXSIZE):
+        self.data_dir = data_dir
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def _locate(self, chart_type, version):
+        stem = os.path.join(self.data_dir, f"{chart_type}_{version}")
+        header_path, _ = sidecar.sidecar_paths(stem)
+        if os.path.exists(header_path):
+            return header_path, "binary"
+        if os.path.exists(f"{stem}.json"):
+            return f"{stem}.json", "json"
+        raise FileNotFoundError(f"No test data for {chart_type} version {version} in {self.data_dir}")
+
+    def load(self, chart_type, version):
+        """Return the data dict of ``chart_type`` version ``version``."""
+        key = (chart_type, int(version))
+        path, kind = self._locate(*key)
+        stat = os.stat(path)
+        signature = (path, stat.st_mtime_ns, stat.st_size)
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == signature:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+
+        self.misses += 1
+        data = sidecar.read(path, mmap=True) if kind == "binary" else _read_json(path)
+        self._entries[key] = (signature, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            # Dropping the last reference to a memmap closes its file handle.
+            self._entries.popitem(last=False)
+        return data
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+
+
+_loaders = {}
+
+
+def load(chart_type, version, data_dir=DEFAULT_DATA_DIR):
+    """Load chart data through a shared :class:`ChartDataLoader` for ``data_dir``."""
+    loader = _loaders.get(data_dir)
+    if loader is None:
+        loader = _loaders[data_dir] = ChartDataLoader(data_dir)
+    return loader.load(chart_type, version)
@@ -0,0 +1,86 @@
+"""Bulk data of mpld3 plugins, written once ahead of the figure.
+
+mpld3 repeats the figure JSON, plugin props included, for each of the ways
+it can load its scripts, so large arrays are kept out of the props.  A
+:class:`DataPlugin` holds them in :attr:`~DataPlugin.data` instead, and
+:meth:`~DataPlugin.data_script` returns a ``<script>`` that stores them in
+``window.mpld3PluginData[<element id>]`` for the plugin to pick up (and
+delete) when it is drawn.  Arrays are base64 strings of their little-endian
+bytes, viewed as typed arrays in the page, and long runs of float values are
+best written with :func:`encode_values`, 4 bytes a value or none at all.
+
+This module imports mpld3, which imports pyplot, so it is only imported by
+the generator once a chart is exported.
+"""
+import base64
+import json
+
+import numpy as np
+from mpld3 import plugins
+
+# Global holding the bulk data of every plugin on the page, by element id.
+DATA_GLOBAL = "mpld3PluginData"
+
+# Largest offset of the fixed-point values of :func:`encode_values`.
+FIXED_MAX = 2 ** 32 - 1
+
+# JavaScript helpers shared by the plugins: take a plugin's data off the
+# page, decode a base64 array into a typed array and read encoded values.
+JAVASCRIPT = r"""
+    var pluginData = {
+        take: function(id) {
+            var data = window.%(global)s[id];
+            delete window.%(global)s[id];
+            return data;
+        },
+        decode: function(data, Type) {
+            var raw = atob(data), bytes = new Uint8Array(raw.length);
+            for (var i = 0; i < raw.length; i++) bytes[i] = raw.charCodeAt(i);
+            return new Type(bytes.buffer);
+        },
+        // Accessor of the i-th value of an encode_values() object.
+        values: function(data) {
+            var start = data.start, step = data.step;
+            if (data.data === undefined) {
+                return function(i) { return start + i * step; };
+            }
+            var offsets = this.decode(data.data, Uint32Array);
+            return function(i) { return start + offsets[i] * step; };
+        }
+    };
+""" % {"global": DATA_GLOBAL}
+
+
+def encode(array, dtype):
+    """Return ``array`` as a base64 string of its ``dtype`` bytes."""
+    return base64.b64encode(np.ascontiguousarray(array, dtype=dtype).tobytes()).decode("ascii")
+
+
+def encode_values(values):
+    """Return float ``values`` as ``{"start", "step"}`` plus, unless they are
+    evenly spaced, their ``"data"``: ``values[i]`` is ``start + step * i``,
+    or ``start + step * data[i]`` with ``data`` the uint32 offsets of each
+    value from the minimum, to ``1 / 2**32`` of their range (:func:`encode`).
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n > 1:
+        step = (values[-1] - values[0]) / (n - 1)
+        if step and np.allclose(values, values[0] + step * np.arange(n),
+                                rtol=0, atol=abs(step) * 1e-6):
+            return {"start": float(values[0]), "step": float(step)}
+    start = float(values.min()) if n else 0.0
+    step = (float(values.max()) - start) / FIXED_MAX if n else 0.0
+    offsets = np.rint((values - start) / step) if step else np.zeros(n)
+    return {"start": start, "step": step, "data": encode(offsets, "<u4")}
+
+
+class DataPlugin(plugins.PluginBase):
+    """mpld3 plugin for element ``dict_["id"]`` with bulk ``data``."""
+
+    data = None
+
+    def data_script(self):
+        """Return the ``<script>`` defining :attr:`data`, to precede the figure."""
+        return (f"<script>\n(window.{DATA_GLOBAL} = window.{DATA_GLOBAL} || {{}})"
+                f"[{json.dumps(self.dict_['id'])}] = {json.dumps(self.data)};\n</script>\n")
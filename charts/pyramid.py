@@ -0,0 +1,60 @@
+"""Multi-resolution levels of chart data for zoom-aware export.
+
+A pyramid is a list of index arrays into the full data, coarsest first, each
+about ``factor`` times larger than the one before and each sorted by x so a
+zoomed x range can be found by binary search.  The full data is the implicit
+finest level.
+
+``line`` and ``area``
+    Per-bucket min/max (:func:`charts.downsample.minmax`), so every level
+    keeps the envelope of the signal.  The x data must be sorted.
+``scatter``
+    One point per occupied cell of a square grid over the data, which keeps
+    the coverage of the cloud.  Scatter data is not sorted by x, so the
+    pyramid ends with the x order of every point as an explicit finest level.
+"""
+import numpy as np
+
+from charts.downsample import minmax
+
+KINDS = ("line", "area", "scatter")
+
+
+def thin_grid(x, y, n_points):
+    """Return the indices of one point per cell of a grid of ~``n_points`` cells."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    cells = max(1, int(np.sqrt(n_points)))
+
+    def cell_of(values):
+        lo, hi = values.min(), values.max()
+        scale = cells / (hi - lo) if hi > lo else 0.0
+        return np.minimum(((values - lo) * scale).astype(np.intp), cells - 1)
+
+    _, first = np.unique(cell_of(x) * cells + cell_of(y), return_index=True)
+    return np.sort(first)
+
+
+def build_levels(x, y, kind, base_points, factor=4):
+    """Return the pyramid levels of ``(x, y)`` for a chart element of ``kind``.
+
+    The coarsest level holds at most ``base_points`` points.  Levels stop
+    once the next one would hold more than ``1 / factor`` of the data.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown pyramid kind: {kind!r}")
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    levels = []
+    points = base_points
+    while points * factor <= n or not levels:
+        if kind == "scatter":
+            indices = thin_grid(x, y, points)
+            indices = indices[np.argsort(x[indices], kind="stable")]
+        else:
+            indices = minmax(x, y, max(1, (points - 2) // 2))
+        levels.append(indices.astype(np.uint32))
+        points *= factor
+    if kind == "scatter":
+        levels.append(np.argsort(x, kind="stable").astype(np.uint32))
+    return levels
@@ -0,0 +1,89 @@
+"""Raster export of heatmap matrices.
+
+In raster mode a heatmap's matrix is colormapped and quantized to an 8-bit
+RGBA image exactly once.  The figure draws that image, so the PNG mpld3
+embeds in the HTML has the same pixels, and the image is also written next
+to the test data as ``<chart>_<version>.png`` (or ``.webp``).  The matrix
+itself goes to the binary sidecar as float32 or float16 instead of a nested
+JSON list, so both the page and the test data grow with the compressed
+pixels rather than with the number of cells written out as text.
+
+An optional tile pyramid splits the image into ``tile_size`` square tiles at
+every power-of-two zoom level, ``<stem>_tiles/<z>/<row>_<col>.<format>``,
+with ``z = 0`` a single tile of the whole image as in web map tiles.
+"""
+import os
+
+import numpy as np
+
+IMAGE_FORMATS = ("png", "webp")
+DTYPES = {"float32": "<f4", "float16": "<f2"}
+DEFAULT_TILE_SIZE = 256
+
+
+def quantize(matrix, cmap, vmin=None, vmax=None):
+    """Colormap ``matrix`` into an ``(rows, cols, 4)`` uint8 RGBA image."""
+    # Imported here so that the constants above don't cost a matplotlib import.
+    from matplotlib import colormaps
+    from matplotlib.colors import Normalize
+
+    return colormaps[cmap](Normalize(vmin, vmax)(matrix), bytes=True)
+
+
+def write_image(rgba, path, fmt="png"):
+    """Write an RGBA image as ``fmt`` (lossless for WebP)."""
+    from PIL import Image  # Pillow is a matplotlib dependency
+
+    options = {"lossless": True} if fmt == "webp" else {}
+    Image.fromarray(rgba).save(path, format=fmt.upper(), **options)
+
+
+def _level_shapes(shape, tile_size):
+    # Image shapes from full resolution down to the level that fits one tile.
+    shapes = [tuple(shape[:2])]
+    while max(shapes[-1]) > tile_size:
+        rows, cols = shapes[-1]
+        shapes.append(((rows + 1) // 2, (cols + 1) // 2))
+    return shapes[::-1]
+
+
+def tile_paths(stem, shape, fmt="png", tile_size=DEFAULT_TILE_SIZE):
+    """Return the tile files of an image of ``shape``, coarsest level first."""
+    paths = []
+    for z, (rows, cols) in enumerate(_level_shapes(shape, tile_size)):
+        for row in range(-(-rows // tile_size)):
+            for col in range(-(-cols // tile_size)):
+                paths.append(os.path.join(f"{stem}_tiles", str(z), f"{row}_{col}.{fmt}"))
+    return paths
+
+
+def _halve(rgba):
+    # Average 2x2 blocks, repeating the last row/column of odd-sized images.
+    rows, cols = rgba.shape[:2]
+    padded = np.pad(rgba, ((0, rows % 2), (0, cols % 2), (0, 0)), mode="edge")
+    blocks = padded.reshape(padded.shape[0] // 2, 2, padded.shape[1] // 2, 2, 4)
+    return (blocks.mean(axis=(1, 3)) + 0.5).astype(np.uint8)
+
+
+def write_tiles(rgba, stem, fmt="png", tile_size=DEFAULT_TILE_SIZE):
+    """Write the tile pyramid of ``rgba``; returns its description."""
+    images = [rgba]
+    for _ in _level_shapes(rgba.shape, tile_size)[1:]:
+        images.append(_halve(images[-1]))
+    images.reverse()
+    levels = []
+    for z, image in enumerate(images):
+        os.makedirs(os.path.join(f"{stem}_tiles", str(z)), exist_ok=True)
+        rows, cols = image.shape[:2]
+        for row in range(0, rows, tile_size):
+            for col in range(0, cols, tile_size):
+                path = os.path.join(f"{stem}_tiles", str(z),
+                                    f"{row // tile_size}_{col // tile_size}.{fmt}")
+                write_image(np.ascontiguousarray(image[row:row + tile_size, col:col + tile_size]),
+                            path, fmt)
+        levels.append([rows, cols])
+    return {
+        "directory": os.path.basename(f"{stem}_tiles"),
+        "tile_size": tile_size,
+        "levels": levels,
+    }
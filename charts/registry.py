@@ -0,0 +1,117 @@
+"""Declarative registry of chart types and their size matrix.
+
+Every chart type maps to a data function, a draw function, the projection of
+its axes and a list of sizes.  Version
+``n`` of a chart is built with the ``n``-th size (1-based), so the default
+matrix reproduces the historical ``<chart>_1`` / ``<chart>_2`` outputs while
+extra sizes can be appended from a config file or the command line.
+"""
+import json
+import zlib
+from collections import namedtuple
+
+import numpy as np
+
+ChartSpec = namedtuple(
+    "ChartSpec",
+    ["chart_type", "make_data", "draw", "sizes", "projection", "downsample_keys", "pyramid",
+     "raster", "canvas", "modules"],
+)
+
+Job = namedtuple("Job", ["chart_type", "version", "size"])
+
+# Filled by the ``register`` decorators of charts.builders.  It is read as
+# ``CHART_REGISTRY``, which imports the builders first (see ``__getattr__``),
+# so that importing the registry alone does not import matplotlib.
+_specs = {}
+
+DEFAULT_SEED = 0
+
+
+def _chart_registry():
+    import charts.builders  # noqa: F401  (registers the chart builders)
+    return _specs
+
+
+def __getattr__(name):
+    if name == "CHART_REGISTRY":
+        return _chart_registry()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def register(chart_type, make_data, sizes, projection=None, downsample=None, pyramid=None,
+             raster=None, canvas=None, modules=()):
+    """Register the decorated draw function for ``chart_type``.
+
+    ``make_data(size, rng)`` must return a dict of the values plotted, drawing
+    any random numbers from ``rng``, and the draw function is called as
+    ``draw(ax, data)`` with an empty axes of ``projection`` (``None`` for
+    cartesian axes) to draw that dict on.  ``downsample`` names the
+    ``(x, y)`` keys of line-like data that may be reduced before export.
+    ``pyramid`` is a ``(kind, x_key, y_key)`` tuple for charts whose data can
+    be exported as a :mod:`charts.pyramid` of the ``kind`` element, and
+    ``raster`` a ``(key, cmap)`` tuple for charts whose matrix can be exported
+    as a :mod:`charts.raster` image, in which case the draw function must
+    draw ``data["image"]`` when it is present.  ``canvas`` names the
+    ``(x, y)`` keys of scatter data that may be drawn by a :mod:`charts.canvas`
+    plugin instead of as SVG.  ``modules`` names the helper modules the
+    data or draw function calls into (say ``"charts.stats"``), whose source
+    is part of the chart's cache key along with that of the two functions.
+    """
+    def decorator(draw):
+        _specs[chart_type] = ChartSpec(chart_type, make_data, draw, tuple(sizes), projection,
+                                       downsample, pyramid, raster, canvas, tuple(modules))
+        return draw
+    return decorator
+
+
+def parse_sizes(values):
+    """Parse ``--sizes`` arguments into a ``{chart_type: sizes}`` mapping.
+
+    Each value is either ``CHART=N,N,...`` for one chart type or ``N,N,...``
+    for every chart type (stored under the ``"*"`` key).
+    """
+    matrix = {}
+    for value in values or []:
+        chart_type, sep, sizes = value.rpartition("=")
+        try:
+            matrix[chart_type if sep else "*"] = [int(s) for s in sizes.split(",") if s]
+        except ValueError:
+            raise ValueError(f"Invalid size list: {value!r}") from None
+    return matrix
+
+
+def load_size_config(path):
+    """Load a ``{chart_type: [sizes]}`` JSON config file."""
+    with open(path) as f:
+        matrix = json.load(f)
+    if not isinstance(matrix, dict):
+        raise ValueError(f"{path}: expected a mapping of chart type to sizes")
+    return {chart_type: [int(s) for s in sizes] for chart_type, sizes in matrix.items()}
+
+
+def iter_jobs(chart_types=None, sizes=None):
+    """Lazily yield a ``Job`` for every chart type and size, in registry order.
+
+    ``sizes`` overrides the registered sizes per chart type; a ``"*"`` entry
+    applies to every chart type without its own entry.
+    """
+    registry, sizes = _chart_registry(), sizes or {}
+    for chart_type in chart_types or registry:
+        if chart_type not in registry:
+            raise ValueError(f"Unknown chart type: {chart_type}")
+        chart_sizes = sizes.get(chart_type, sizes.get("*", registry[chart_type].sizes))
+        for version, size in enumerate(chart_sizes, start=1):
+            yield Job(chart_type, version, size)
+
+
+def job_rng(job, seed=DEFAULT_SEED):
+    """Return the random generator for ``job`` derived from the master ``seed``.
+
+    The child ``SeedSequence`` is the one ``SeedSequence(seed).spawn`` would
+    create, but its spawn key is the job's identity (chart type and version)
+    rather than its position in the sweep, so the data does not depend on
+    which jobs run, in what order or on how many workers.
+    """
+    key = (zlib.crc32(job.chart_type.encode()), job.version)
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=key))
@@ -0,0 +1,73 @@
+"""Batch rendering of figures to image bytes.
+
+:func:`render_many` rasterizes a batch of figures on a thread pool.  The
+figures are built with the object-oriented API (see :mod:`charts.builders`),
+so no pyplot state is shared between threads, and each figure is only ever
+drawn by one thread.  Work done outside the GIL, such as PNG compression,
+overlaps between figures; ``benchmarks/bench_render_many.py`` measures the
+gain against a serial loop.
+
+:func:`save_formats` writes one figure in several formats.  Drawing is the
+same for every format and mutates the figure (``savefig`` even swaps its
+canvas for the vector backends), so the formats are drawn one after another;
+only writing the finished bytes to disk runs in the background.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+# Formats :func:`save_formats` writes next to the mpld3 HTML.
+STATIC_FORMATS = ("png", "svg", "pdf")
+
+
+def render(fig, fmt="png", **savefig_kwargs):
+    """Return ``fig`` saved as ``fmt`` bytes."""
+    buf = BytesIO()
+    fig.savefig(buf, format=fmt, **savefig_kwargs)
+    return buf.getvalue()
+
+
+def render_many(figs, fmt="png", workers=None, **savefig_kwargs):
+    """Render ``figs`` as ``fmt`` on ``workers`` threads (default: CPU count).
+
+    Returns the byte buffers in the same order as ``figs``.  A figure that
+    appears more than once is rendered once, since a figure must not be
+    drawn from two threads at the same time.
+    """
+    figs = list(figs)
+    unique = list({id(fig): fig for fig in figs}.values())
+    workers = workers or os.cpu_count() or 1
+
+    if workers <= 1 or len(unique) <= 1:
+        buffers = [render(fig, fmt, **savefig_kwargs) for fig in unique]
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(unique))) as executor:
+            buffers = list(executor.map(lambda fig: render(fig, fmt, **savefig_kwargs), unique))
+
+    by_id = {id(fig): buf for fig, buf in zip(unique, buffers)}
+    return [by_id[id(fig)] for fig in figs]
+
+
+def _write_bytes(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def save_formats(fig, paths, **savefig_kwargs):
+    """Save ``fig`` to each ``{fmt: path}`` of ``paths``.
+
+    Each format is drawn on the calling thread while the previous one is
+    written to disk.  Returns ``{fmt: seconds}`` spent drawing each format.
+    """
+    timings = {}
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        pending = []
+        for fmt, path in paths.items():
+            start = time.perf_counter()
+            data = render(fig, fmt, **savefig_kwargs)
+            timings[fmt] = time.perf_counter() - start
+            pending.append(writer.submit(_write_bytes, path, data))
+        for future in pending:
+            future.result()
+    return timings
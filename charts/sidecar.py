@@ -0,0 +1,113 @@
+"""Binary sidecar format for chart test data.
+
+A sidecar is a pair of files next to the JSON test data:
+
+``<chart>_<version>.bin``
+    Raw little-endian array data, each array starting at an offset aligned
+    to 8 bytes so it can be viewed in place as a ``Float64Array`` (or
+    ``Float32Array``) in Node or memory-mapped with ``np.memmap``.
+
+``<chart>_<version>.bin.json``
+    A small JSON header.  Non-array values are stored as they are under
+    ``"values"``; every array is described under ``"arrays"`` by its
+    ``dtype``, ``shape``, byte ``offset`` and ``nbytes`` in the blob.  A list
+    of arrays (e.g. box plot groups) is stored as a list of such entries.
+"""
+import json
+import os
+
+import numpy as np
+
+FORMAT_NAME = "chart-data-bin"
+FORMAT_VERSION = 1
+ALIGNMENT = 8
+DEFAULT_DTYPE = "<f8"
+_CHUNK_SIZE = 1 << 16
+
+
+def sidecar_paths(stem):
+    """Return ``(header_path, blob_path)`` for the data file stem ``stem``."""
+    return f"{stem}.bin.json", f"{stem}.bin"
+
+
+def _is_array_list(value):
+    return isinstance(value, (list, tuple)) and value and all(
+        isinstance(v, np.ndarray) for v in value
+    )
+
+
+def _write_array(f, array, dtype):
+    # Pad to the alignment, then write ``array`` as ``dtype`` a chunk at a time
+    # so no full converted copy of a large array is made.
+    f.write(b"\0" * (-f.tell() % ALIGNMENT))
+    offset = f.tell()
+    flat = np.asarray(array).reshape(-1)
+    for start in range(0, len(flat), _CHUNK_SIZE):
+        f.write(flat[start:start + _CHUNK_SIZE].astype(dtype, copy=False).tobytes())
+    dtype = np.dtype(dtype)
+    return {
+        "dtype": dtype.str,
+        "shape": list(np.shape(array)),
+        "offset": offset,
+        "nbytes": flat.size * dtype.itemsize,
+    }
+
+
+def write(data_dict, stem, dtype=DEFAULT_DTYPE, dtypes=None):
+    """Write ``data_dict`` as a sidecar for ``stem``; returns the two paths.
+
+    Numeric arrays are stored as ``dtype`` (little-endian float64 by default)
+    unless ``dtypes`` maps their key to another one, e.g. ``"<f4"`` for a
+    large heatmap matrix.  Consumers read the dtype of each array entry.
+    """
+    dtypes = dtypes or {}
+    header_path, blob_path = sidecar_paths(stem)
+    header = {
+        "format": FORMAT_NAME,
+        "format_version": FORMAT_VERSION,
+        "blob": os.path.basename(blob_path),
+        "values": {},
+        "arrays": {},
+    }
+    with open(blob_path, "wb") as f:
+        for key, value in data_dict.items():
+            if isinstance(value, np.ndarray) and value.dtype.kind in "biuf":
+                header["arrays"][key] = _write_array(f, value, dtypes.get(key, dtype))
+            elif _is_array_list(value):
+                header["arrays"][key] = [_write_array(f, v, dtypes.get(key, dtype))
+                                         for v in value]
+            elif isinstance(value, np.generic):
+                header["values"][key] = value.item()
+            else:
+                header["values"][key] = value
+    with open(header_path, "w") as f:
+        json.dump(header, f, indent=2)
+    return header_path, blob_path
+
+
+def _view(blob_path, entry, mmap):
+    shape = tuple(entry["shape"])
+    if mmap:
+        if not entry["nbytes"]:
+            return np.empty(shape, dtype=entry["dtype"])
+        return np.memmap(blob_path, dtype=entry["dtype"], mode="r",
+                         offset=entry["offset"], shape=shape)
+    count = int(np.prod(shape))
+    return np.fromfile(blob_path, dtype=entry["dtype"], count=count,
+                       offset=entry["offset"]).reshape(shape)
+
+
+def read(header_path, mmap=True):
+    """Read a sidecar back into a dict, memory-mapping arrays by default."""
+    with open(header_path) as f:
+        header = json.load(f)
+    if header.get("format") != FORMAT_NAME:
+        raise ValueError(f"{header_path}: not a chart data sidecar")
+    blob_path = os.path.join(os.path.dirname(header_path), header["blob"])
+    data = dict(header["values"])
+    for key, entry in header["arrays"].items():
+        if isinstance(entry, list):
+            data[key] = [_view(blob_path, e, mmap) for e in entry]
+        else:
+            data[key] = _view(blob_path, entry, mmap)
+    return data
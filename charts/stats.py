@@ -0,0 +1,64 @@
+"""Summary statistics computed once and shared by the figure and test data.
+
+The histogram and box plot builders draw from these precomputed values with
+``ax.stairs`` / ``ax.bxp`` instead of letting matplotlib bin the samples or
+compute quartiles again, and the same values are saved with the test data
+so it can be validated without the raw samples.
+
+Box plot statistics follow ``matplotlib.cbook.boxplot_stats`` (linear
+percentiles, whiskers at the furthest sample within ``whis`` IQRs of the
+box) but are computed for all groups at once.
+"""
+import numpy as np
+
+# Per-group box plot statistics, in the order they are stored.
+BOX_STATS = ("q1", "med", "q3", "whislo", "whishi", "mean")
+
+
+def histogram_stats(data, bins=10):
+    """Return ``{"counts", "bins"}`` for ``data`` binned into ``bins`` bins."""
+    counts, edges = np.histogram(data, bins=bins)
+    return {"counts": counts, "bins": edges}
+
+
+def box_stats(groups, whis=1.5):
+    """Return the box plot statistics of every group of samples.
+
+    ``groups`` is a 2D array with one group per row or a list of 1D arrays of
+    any lengths.  Every entry of :data:`BOX_STATS` maps to an array with one
+    value per group, and ``"fliers"`` to a list of arrays of the samples
+    outside the whiskers.
+    """
+    if isinstance(groups, np.ndarray) and groups.ndim == 2:
+        values = groups.astype(float)
+    else:
+        # Pad ragged groups with NaN, which every reduction below ignores.
+        values = np.full((len(groups), max(len(g) for g in groups)), np.nan)
+        for row, group in zip(values, groups):
+            row[:len(group)] = group
+
+    q1, med, q3 = np.nanpercentile(values, [25, 50, 75], axis=1)
+    iqr = q3 - q1
+    low = np.where(values >= (q1 - whis * iqr)[:, None], values, np.inf).min(axis=1)
+    high = np.where(values <= (q3 + whis * iqr)[:, None], values, -np.inf).max(axis=1)
+    whislo = np.where(low > q1, q1, low)
+    whishi = np.where(high < q3, q3, high)
+    below, above = values < whislo[:, None], values > whishi[:, None]
+    return {
+        "q1": q1,
+        "med": med,
+        "q3": q3,
+        "whislo": whislo,
+        "whishi": whishi,
+        "mean": np.nanmean(values, axis=1),
+        # Low fliers first, as in matplotlib.cbook.boxplot_stats.
+        "fliers": [np.concatenate([row[lo], row[hi]]) for row, lo, hi in zip(values, below, above)],
+    }
+
+
+def bxp_stats(stats):
+    """Split :func:`box_stats` output into the per-box dicts ``ax.bxp`` takes."""
+    return [
+        {**{key: stats[key][i] for key in BOX_STATS}, "fliers": fliers}
+        for i, fliers in enumerate(stats["fliers"])
+    ]
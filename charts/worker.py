@@ -0,0 +1,125 @@
+"""Long-lived chart worker driven by JSON lines on stdin and stdout.
+
+``generate-charts.js`` keeps one worker per CPU core running for a whole
+sweep, so NumPy, matplotlib, mpld3 and the chart builders are imported once
+per worker rather than once per chart.  A worker is started with the options
+of ``generate.py`` (``--workers`` is left to the driver)::
+
+    python charts/worker.py --charts line_chart,heatmap --formats html,png
+
+and first writes ``{"ready": true, "pid": ...}``.  Every request is one JSON
+object per line with an ``id``, which its reply echoes:
+
+* ``{"op": "plan"}`` creates the output folders, installs the
+  :mod:`charts.assets` and replies ``{"jobs": [[chart_type, version, size], ...]}``.
+  Send it to one worker before any job.
+* ``{"op": "run", "job": [chart_type, version, size]}`` builds the chart and
+  replies with its ``chart_paths``, ``data_paths``, ``digest``, ``cached``
+  flag, ``stats`` (see :func:`charts.generate.run_job`) and the ``seconds``
+  it took.
+* ``{"op": "finish", "results": [...]}`` takes the ``run`` replies in job
+  order, updates the cache manifest, writes the bundles and profile and
+  replies ``{"summary": [lines]}``.
+
+A failed request is answered with ``{"id": ..., "error": traceback}`` and the
+worker carries on.  It exits at the end of its input.
+"""
+import json
+import os
+import sys
+import time
+import traceback
+
+if __package__ in (None, ""):
+    # Allow ``python charts/worker.py`` from the repository root.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from charts import assets, generate, registry
+from charts.registry import Job
+
+
+class Worker:
+    """Serve the requests of one run configured by the parsed ``args``."""
+
+    def __init__(self, args):
+        from charts.cache import OutputCache
+
+        self.args = args
+        self.save_options = generate._save_options(args)
+        if args.local_assets and "html" in args.formats:
+            self.save_options["asset_urls"] = assets.urls()
+        # Warm up: select Agg and import the builders (and mpld3) before the first job.
+        generate._init_worker(OutputCache.load(args.output_dir) if args.use_cache else None)
+        registry.CHART_REGISTRY
+        if "html" in args.formats:
+            import mpld3  # noqa: F401
+
+    def handle(self, request):
+        """Return the reply to ``request``."""
+        try:
+            reply = getattr(self, f"_{request['op']}")(request)
+        except Exception:
+            reply = {"error": traceback.format_exc()}
+        return {"id": request.get("id"), **reply}
+
+    def _plan(self, request):
+        os.makedirs(self.args.output_dir, exist_ok=True)
+        os.makedirs(self.args.data_dir, exist_ok=True)
+        if "asset_urls" in self.save_options:
+            assets.install(self.args.output_dir)
+        return {"jobs": [list(job) for job in generate._jobs(self.args)]}
+
+    def _run(self, request):
+        job = Job(*request["job"])
+        start = time.perf_counter()
+        chart_paths, data_paths, digest, cached, stats = generate.run_job(
+            job, seed=self.args.seed, profile=bool(self.args.profile),
+            changed_only=self.args.changed_only, output_dir=self.args.output_dir,
+            data_dir=self.args.data_dir, **self.save_options)
+        return {"job": list(job), "chart_paths": chart_paths, "data_paths": data_paths,
+                "digest": digest, "cached": cached, "stats": stats,
+                "seconds": time.perf_counter() - start}
+
+    def _finish(self, request):
+        from charts.cache import OutputCache
+
+        args = self.args
+        cache = OutputCache.load(args.output_dir) if args.use_cache else None
+        results = ((Job(*r["job"]), (r["chart_paths"], r["data_paths"], r["digest"],
+                                      r["cached"], r["stats"]))
+                   for r in request["results"])
+        try:
+            collected = generate._collect(results, cache, args.output_dir, args.bundle_size,
+                                          self.save_options.get("asset_urls"))
+            return {"summary": generate._report(collected, args)}
+        finally:
+            if cache is not None:
+                cache.evict(registry.CHART_REGISTRY)
+                cache.save()
+
+
+def serve(worker, lines, out):
+    """Answer each JSON request of ``lines`` on ``out``, one reply per line."""
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            reply = worker.handle(json.loads(line))
+        except ValueError:
+            reply = {"id": None, "error": traceback.format_exc()}
+        out.write(json.dumps(reply) + "\n")
+        out.flush()
+
+
+def main(argv=None):
+    args = generate.parse_args(argv)
+    # Keep stray prints of the libraries off the protocol stream.
+    out, sys.stdout = sys.stdout, sys.stderr
+    worker = Worker(args)
+    out.write(json.dumps({"ready": True, "pid": os.getpid()}) + "\n")
+    out.flush()
+    serve(worker, sys.stdin, out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""mpld3 plugin swapping in pyramid levels as a chart is zoomed.
+
+The chart is exported with the coarsest level of a :mod:`charts.pyramid`.
+The full data, in x order, and the index arrays of the other levels are
+written once ahead of the figure as :mod:`charts.pagedata`: 4 bytes a value
+(:func:`~charts.pagedata.encode_values`, which leaves out evenly spaced x
+altogether) and 4 bytes an index.  They are decoded on the first zoom rather
+than before the chart is drawn.  On each zoom the plugin redraws the element
+with the finest level that still has no more than ``budget`` points inside
+the visible range.  Zoomed far enough in, that is the exact data.
+"""
+import numpy as np
+from mpld3 import plugins, utils
+
+from charts import pagedata
+
+
+class ZoomDetail(pagedata.DataPlugin):
+    """Redraw a line, area or scatter element from pyramid levels on zoom."""
+
+    JAVASCRIPT = pagedata.JAVASCRIPT + r"""
+    mpld3.register_plugin("zoomdetail", ZoomDetail);
+    ZoomDetail.prototype = Object.create(mpld3.Plugin.prototype);
+    ZoomDetail.prototype.constructor = ZoomDetail;
+    ZoomDetail.prototype.requiredProps = ["id", "kind", "budget"];
+    ZoomDetail.prototype.defaultProps = {baseline: 0};
+    function ZoomDetail(fig, props) {
+        mpld3.Plugin.call(this, fig, props);
+    }
+
+    ZoomDetail.prototype.draw = function() {
+        var element = mpld3.get_element(this.props.id, this.fig);
+        this.element = element;
+        this.ax = element.ax;
+        this.data = pluginData.take(this.props.id);
+        this.current = 0;
+        this.pending = false;
+        element.zoomed = this.zoomed.bind(this);
+    };
+
+    ZoomDetail.prototype.load = function() {
+        var data = this.data;
+        this.data = null;
+        this.size = data.size;
+        this.x = pluginData.values(data.x);
+        this.y = pluginData.values(data.y);
+        this.levels = data.levels.map(function(level) {
+            return pluginData.decode(level, Uint32Array);
+        });
+        this.levels.push(null);  // the full data, sorted by x
+    };
+
+    // Index of the k-th point of a level (null is the full data).
+    ZoomDetail.prototype.at = function(level, k) {
+        return level === null ? k : level[k];
+    };
+
+    // First position in level whose x is >= value (or > value if after).
+    ZoomDetail.prototype.search = function(level, value, after) {
+        var lo = 0, hi = level === null ? this.size : level.length;
+        while (lo < hi) {
+            var mid = (lo + hi) >>> 1, v = this.x(this.at(level, mid));
+            if (v < value || (after && v === value)) lo = mid + 1; else hi = mid;
+        }
+        return lo;
+    };
+
+    ZoomDetail.prototype.visible = function(level, view) {
+        var lo = this.search(level, view.x0, false), hi = this.search(level, view.x1, true);
+        if (this.props.kind !== "scatter") {
+            return {lo: lo, hi: hi, count: hi - lo};
+        }
+        var count = 0;
+        for (var k = lo; k < hi && count <= this.props.budget; k++) {
+            var v = this.y(this.at(level, k));
+            if (v >= view.y0 && v <= view.y1) count++;
+        }
+        return {lo: lo, hi: hi, count: count};
+    };
+
+    ZoomDetail.prototype.zoomed = function(transform) {
+        this.transform = transform;
+        if (this.pending) return;
+        this.pending = true;
+        window.requestAnimationFrame(function() {
+            this.pending = false;
+            this.update(this.transform);
+        }.bind(this));
+    };
+
+    ZoomDetail.prototype.update = function(transform) {
+        if (this.data) this.load();
+        var ax = this.ax;
+        var xs = [ax.x.invert(transform.invertX(0)), ax.x.invert(transform.invertX(ax.width))];
+        var ys = [ax.y.invert(transform.invertY(0)), ax.y.invert(transform.invertY(ax.height))];
+        var view = {x0: Math.min(xs[0], xs[1]), x1: Math.max(xs[0], xs[1]),
+                    y0: Math.min(ys[0], ys[1]), y1: Math.max(ys[0], ys[1])};
+
+        var chosen = 0, range = this.visible(this.levels[0], view);
+        for (var i = 1; i < this.levels.length; i++) {
+            var candidate = this.visible(this.levels[i], view);
+            if (candidate.count > this.props.budget) break;
+            chosen = i;
+            range = candidate;
+        }
+        this.current = chosen;
+        var level = this.levels[chosen];
+        var size = level === null ? this.size : level.length;
+        // One point past each edge so lines run off the visible area.
+        var lo = Math.max(range.lo - 1, 0), hi = Math.min(range.hi + 1, size);
+        var scatter = this.props.kind === "scatter", points = [];
+        for (var k = lo; k < hi; k++) {
+            var j = this.at(level, k), y = this.y(j);
+            if (scatter && (y < view.y0 || y > view.y1)) continue;
+            points.push([this.x(j), y]);
+        }
+        this["draw_" + this.props.kind](points);
+    };
+
+    ZoomDetail.prototype.draw_line = function(points) {
+        var line = this.element, xi = line.props.xindex, yi = line.props.yindex;
+        line.data = points.map(function(p) {
+            var row = [];
+            row[xi] = p[0];
+            row[yi] = p[1];
+            return row;
+        });
+        line.path.attr("d", line.datafunc(line.data, line.pathcodes));
+    };
+
+    ZoomDetail.prototype.draw_area = function(points) {
+        var coll = this.element, base = this.props.baseline;
+        if (!points.length) points = [[0, base]];
+        var first = points[0][0], last = points[points.length - 1][0];
+        var vertices = [[first, base]].concat(points, [[last, base]]);
+        var codes = vertices.map(function(_, i) { return i ? "L" : "M"; });
+        codes.push("Z");
+        coll.props.paths = [[vertices, codes]];
+        coll.pathsobj.attr("d", coll.pathFunc.bind(coll));
+    };
+
+    ZoomDetail.prototype.draw_scatter = function(points) {
+        var coll = this.element;
+        coll.group.remove();
+        coll.offsets = points;
+        coll.draw();
+    };
+    """
+
+    def __init__(self, artist, kind, x, y, levels, budget, baseline=0.0):
+        self.dict_ = {
+            "type": "zoomdetail",
+            "id": utils.get_id(artist),
+            "kind": kind,
+            "budget": int(budget),
+            "baseline": float(baseline),
+        }
+        x, y = np.asarray(x), np.asarray(y)
+        if kind == "scatter":
+            # Store the points in the x order of the finest level, so that
+            # the other levels index sorted data as for lines and areas.
+            order, levels = levels[-1], levels[:-1]
+            rank = np.empty_like(order)
+            rank[order] = np.arange(len(order), dtype=order.dtype)
+            x, y, levels = x[order], y[order], [rank[level] for level in levels]
+        self.data = {
+            "size": len(x),
+            "x": pagedata.encode_values(x),
+            "y": pagedata.encode_values(y),
+            "levels": [pagedata.encode(level, "<u4") for level in levels],
+        }
+
+
+def attach(fig, kind, x, y, levels, budget):
+    """Connect a :class:`ZoomDetail` plugin for the ``kind`` element drawn on ``fig``.
+
+    Returns the plugin; its :meth:`~charts.pagedata.DataPlugin.data_script`
+    must be written ahead of the figure HTML.
+    """
+    ax = fig.axes[0]
+    artist = ax.lines[-1] if kind == "line" else ax.collections[-1]
+    plugin = ZoomDetail(artist, kind, x, y, levels, budget)
+    plugins.connect(fig, plugin)
+    return plugin
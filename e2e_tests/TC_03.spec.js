@@ -1,12 +1,12 @@
 // Testcase ID: TC3
 // Testcase Name: Check data points
 // Description: Verify generated HTML file has expected graph data by checking mpld3 figure data against saved test data
-// Input: Load the generated .html file and corresponding test data JSON
+// Input: Load the generated .html file and corresponding test data (JSON or binary sidecar)
 // Expected: Data points in the figure match the saved test data
 const { test, expect } = require("@playwright/test");
 const path = require("path");
-const fs = require("fs");
 import { chartTypes } from "./chartTypes";
+import { canvasPoints, exportedValues, loadTestData, rasterImageBase64 } from "./testData";
 
 const chartVariants = Array.from({ length: 2 }, (_, i) => i + 1); // [1, 2]
 
@@ -21,16 +21,12 @@ for (const chartType of chartTypes) {
           __dirname,
           `../output/${chartType}_${variant}.html`
         );
-        const dataPath = path.join(
-          __dirname,
-          `../test_data/${chartType}_${variant}.json`
-        );
         
+        // Load test data (binary sidecar if generated, JSON otherwise)
+        const testData = loadTestData(chartType, variant);
+
         // Verify test data file exists
-        expect(fs.existsSync(dataPath)).toBe(true);
-        
-        // Load test data
-        const testData = JSON.parse(fs.readFileSync(dataPath, 'utf-8'));
+        expect(testData).not.toBeNull();
         
         // Load chart
         await page.goto(`file://${chartPath}`);
@@ -47,17 +43,21 @@ for (const chartType of chartTypes) {
 
         // Chart-specific verification logic
         switch (chartType) {
-          case 'line_chart':
-            for (let i = 0; i < testData.x.length; i++) {
-                expect(figureData.data.data01[i][0]).toBeCloseTo(testData.x[i], 5);
+          case 'line_chart': {
+            const xs = exportedValues(testData, "x");
+            for (let i = 0; i < xs.length; i++) {
+                expect(figureData.data.data01[i][0]).toBeCloseTo(xs[i], 5);
               }
             break;
+          }
 
-          case 'area_chart':
-            for (let i = 1; i < testData.x.length; i++) {
-                expect(figureData.props.axes[0].collections[0].paths[0][0][i][0]).toBeCloseTo(testData.x[i-1], 5);
+          case 'area_chart': {
+            const xs = exportedValues(testData, "x");
+            for (let i = 1; i < xs.length; i++) {
+                expect(figureData.props.axes[0].collections[0].paths[0][0][i][0]).toBeCloseTo(xs[i-1], 5);
               }
             break;
+          }
 
           case 'stem_plot':
             for (let i = 0; i < testData.x.length; i++) {
@@ -65,18 +65,42 @@ for (const chartType of chartTypes) {
               }
             break;
             
-          case 'scatter_plot':
-            for (let i = 0; i < testData.x.length; i++) {
-                expect(figureData.data.data01[i][0]).toBeCloseTo(testData.x[i], 5);
+          case 'scatter_plot': {
+            const xs = exportedValues(testData, "x");
+            // Large scatter plots may be drawn on a canvas instead of as SVG.
+            const points = testData.canvas ? await canvasPoints(page) : figureData.data.data01;
+            for (let i = 0; i < xs.length; i++) {
+                expect(points[i][0]).toBeCloseTo(xs[i], 5);
               }
             break;
+          }
 
-          case 'polar_plot':
-            for (let i = 0; i < testData.theta.length; i++) {
-                expect(figureData.data.data01[i][0]).toBeCloseTo(testData.theta[i], 5);
+          case 'polar_plot': {
+            const thetas = exportedValues(testData, "theta");
+            for (let i = 0; i < thetas.length; i++) {
+                expect(figureData.data.data01[i][0]).toBeCloseTo(thetas[i], 5);
               }
             break;
+          }
             
+          case 'histogram':
+            // Stairs outline: each bin edge starts a step, the last one closes it.
+            for (let i = 0; i < testData.counts.length; i++) {
+                expect(figureData.data.data01[2 * i + 1][0]).toBeCloseTo(testData.bins[i], 5);
+              }
+            expect(figureData.data.data01[2 * testData.counts.length][0]).toBeCloseTo(
+              testData.bins[testData.counts.length], 5);
+            break;
+
+          case 'heatmap':
+            if (testData.raster && testData.raster.format === 'png') {
+              // Raster export: mpld3 embeds the same quantized image as the sidecar.
+              expect(figureData.props.axes[0].images[0].data).toBe(rasterImageBase64(testData));
+            } else {
+              expect(figureData.data.data01).not.toBeNull();
+            }
+            break;
+
           default:
             // Keep null checks for unsupported chart types
             expect(figureData.data.data01).not.toBeNull();
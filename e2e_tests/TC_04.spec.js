@@ -1,12 +1,12 @@
 // Testcase ID: TC4
 // Testcase Name: Data integrity after rendering
 // Description: Verify that rendered graph data matches original input data within acceptable error margin
-// Input: Load generated HTML file and corresponding test data JSON
+// Input: Load generated HTML file and corresponding test data (JSON or binary sidecar)
 // Expected: No significant mismatch between input and visualized data
 const { test, expect } = require("@playwright/test");
 const path = require("path");
-const fs = require("fs");
 import { chartTypes } from "./chartTypes";
+import { canvasPoints, exportedValues, loadTestData } from "./testData";
 
 const chartVariants = Array.from({ length: 2 }, (_, i) => i + 1); // [1, 2]
 
@@ -21,16 +21,12 @@ for (const chartType of chartTypes) {
           __dirname,
           `../output/${chartType}_${variant}.html`
         );
-        const dataPath = path.join(
-          __dirname,
-          `../test_data/${chartType}_${variant}.json`
-        );
         
+        // Load test data (binary sidecar if generated, JSON otherwise)
+        const testData = loadTestData(chartType, variant);
+
         // Verify test data file exists
-        expect(fs.existsSync(dataPath)).toBe(true);
-        
-        // Load test data
-        const testData = JSON.parse(fs.readFileSync(dataPath, 'utf-8'));
+        expect(testData).not.toBeNull();
         
         // Load chart
         await page.goto(`file://${chartPath}`);
@@ -47,17 +43,21 @@ for (const chartType of chartTypes) {
 
         // Chart-specific verification logic
         switch (chartType) {
-          case 'line_chart':
-            for (let i = 0; i < testData.y.length; i++) {
-                expect(figureData.data.data01[i][1]).toBeCloseTo(testData.y[i], 5);
+          case 'line_chart': {
+            const ys = exportedValues(testData, "y");
+            for (let i = 0; i < ys.length; i++) {
+                expect(figureData.data.data01[i][1]).toBeCloseTo(ys[i], 5);
               }
             break;
+          }
 
-          case 'area_chart':
-            for (let i = 1; i < testData.y.length; i++) {
-                expect(figureData.props.axes[0].collections[0].paths[0][0][i][1]).toBeCloseTo(testData.y[i-1], 5);
+          case 'area_chart': {
+            const ys = exportedValues(testData, "y");
+            for (let i = 1; i < ys.length; i++) {
+                expect(figureData.props.axes[0].collections[0].paths[0][0][i][1]).toBeCloseTo(ys[i-1], 5);
               }
             break;
+          }
 
           case 'stem_plot':
             for (let i = 0; i < testData.y.length; i++) {
@@ -65,18 +65,31 @@ for (const chartType of chartTypes) {
               }
             break;
             
-          case 'scatter_plot':
-            for (let i = 0; i < testData.y.length; i++) {
-                expect(figureData.data.data01[i][1]).toBeCloseTo(testData.y[i], 5);
+          case 'scatter_plot': {
+            const ys = exportedValues(testData, "y");
+            // Large scatter plots may be drawn on a canvas instead of as SVG.
+            const points = testData.canvas ? await canvasPoints(page) : figureData.data.data01;
+            for (let i = 0; i < ys.length; i++) {
+                expect(points[i][1]).toBeCloseTo(ys[i], 5);
               }
             break;
+          }
 
-          case 'polar_plot':
-            for (let i = 0; i < testData.r.length; i++) {
-                expect(figureData.data.data01[i][1]).toBeCloseTo(testData.r[i], 5);
+          case 'polar_plot': {
+            const rs = exportedValues(testData, "r");
+            for (let i = 0; i < rs.length; i++) {
+                expect(figureData.data.data01[i][1]).toBeCloseTo(rs[i], 5);
               }
             break;
+          }
             
+          case 'histogram':
+            // Stairs outline: each step is drawn at the height of its bin count.
+            for (let i = 0; i < testData.counts.length; i++) {
+                expect(figureData.data.data01[2 * i + 1][1]).toBeCloseTo(testData.counts[i], 5);
+              }
+            break;
+
           default:
             // Keep null checks for unsupported chart types
             expect(figureData.data.data01).not.toBeNull();
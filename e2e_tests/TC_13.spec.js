@@ -0,0 +1,50 @@
+// Tescase ID: TC13
+// Testcase Name: Bundle pages render every figure
+// Description: Check all figures of a bundle page from a single page load
+// Input: Bundle pages written by `python charts/generate.py --bundle N`
+// Expected: Each figure container holds a chart and a toolbar SVG, its axes and its title
+const { test, expect } = require("@playwright/test");
+const fs = require("fs");
+const path = require("path");
+
+const bundlesDir = path.join(__dirname, "../output/bundles");
+const manifestPath = path.join(bundlesDir, "bundles.json");
+const manifest = fs.existsSync(manifestPath)
+  ? JSON.parse(fs.readFileSync(manifestPath, "utf8"))
+  : { bundles: [] };
+
+// "stacked_bar_chart" -> "Stacked Bar Chart"
+const chartTitle = (chartType) =>
+  chartType
+    .split("_")
+    .map((word) => word[0].toUpperCase() + word.slice(1))
+    .join(" ");
+
+test.describe("bundle pages", () => {
+  test.skip(manifest.bundles.length === 0, "no bundles generated (use --bundle N)");
+
+  for (const bundle of manifest.bundles) {
+    test(`TC13[${bundle.file}]: all ${bundle.charts.length} figures render`, async ({
+      page,
+    }) => {
+      const errorLogs = [];
+      page.on("pageerror", (error) => {
+        errorLogs.push(error.message);
+      });
+
+      await page.goto("file://" + path.join(bundlesDir, bundle.file));
+      await page.waitForLoadState("load");
+
+      for (const chart of bundle.charts) {
+        const figure = page.locator(`#${chart.id}`);
+        // one for chart and one for toolbar
+        await expect(figure.locator("svg")).toHaveCount(2);
+        await expect(figure.locator(".mpld3-xaxis").first()).toBeVisible();
+        await expect(figure.locator(".mpld3-yaxis").first()).toBeVisible();
+        await expect(figure.locator(`text=${chartTitle(chart.chart_type)}`).first()).toBeVisible();
+      }
+
+      expect(errorLogs.length).toBe(0);
+    });
+  }
+});
@@ -0,0 +1,112 @@
+// Tescase ID: TC14
+// Testcase Name: Zoom detail of pyramid charts
+// Description: Verify that zooming into a chart exported with `--pyramid` redraws it from finer pyramid levels
+// Input: "1. Generate line, area and scatter charts above the point budget with --pyramid 2. Click the box zoom icon and zoom in with the mouse wheel"
+// Expected: The page stays small, and the zoomed view shows several times more points than the exported coarse level has there, without page errors
+const { test, expect } = require("@playwright/test");
+const fs = require("fs");
+const path = require("path");
+import { generateCharts } from "./generate";
+
+// Far above the ~1000 point budget of the default axes width.
+const SIZE = 100000;
+const pyramidCharts = { line_chart: "line", area_chart: "area", scatter_plot: "scatter" };
+// The full data is embedded at 4 bytes a value (8 before base64 for a scatter
+// plot, whose x is not evenly spaced) on top of the coarse chart.
+const MAX_PAGE_BYTES = 16 * SIZE;
+
+let outputDir;
+
+test.beforeAll(() => {
+  test.setTimeout(120000);
+  ({ outputDir } = generateCharts("pyramid", [
+    "--charts", Object.keys(pyramidCharts).join(","),
+    "--sizes", String(SIZE),
+    "--pyramid",
+  ]));
+});
+
+// Points drawn by the data element of the chart, in the coordinates of the
+// zoomed `.mpld3-paths` group: the center of each marker of a scatter plot,
+// the vertices of the line or area path otherwise.
+function drawnPoints(kind) {
+  const group = document.querySelector(".mpld3-paths");
+  const paths = Array.from(group.querySelectorAll("path"));
+  const toGroup = (element) => group.getCTM().inverse().multiply(element.getCTM());
+  const point = (x, y, matrix) => {
+    const p = new DOMPoint(x, y).matrixTransform(matrix);
+    return [p.x, p.y];
+  };
+  if (kind === "scatter") {
+    return paths.map((p) => point(0, 0, toGroup(p)));
+  }
+  const numbers = (p) => p.getAttribute("d").match(/-?\d*\.?\d+(?:e[-+]?\d+)?/gi) || [];
+  const element = paths.reduce((a, b) => (numbers(b).length > numbers(a).length ? b : a));
+  const values = numbers(element).map(Number);
+  const matrix = toGroup(element);
+  const points = [];
+  for (let i = 0; i + 1 < values.length; i += 2) {
+    points.push(point(values[i], values[i + 1], matrix));
+  }
+  return points;
+}
+
+// How many of `points` (in `.mpld3-paths` coordinates) are inside the axes
+// as currently zoomed. Like the plugin, lines and areas only look at the x
+// range: the curve may well run above or below the zoomed view.
+function countInView({ points, kind }) {
+  const matrix = document.querySelector(".mpld3-paths").getScreenCTM();
+  const box = document.querySelector(".mpld3-axesbg").getBoundingClientRect();
+  return points.filter(([x, y]) => {
+    const p = new DOMPoint(x, y).matrixTransform(matrix);
+    const inY = kind !== "scatter" || (p.y >= box.top && p.y <= box.bottom);
+    return p.x >= box.left && p.x <= box.right && inY;
+  }).length;
+}
+
+for (const [chartType, kind] of Object.entries(pyramidCharts)) {
+  test.describe(`${chartType} - pyramid`, () => {
+    test(`TC14[${chartType}]: zooming in draws finer pyramid levels`, async ({ page }) => {
+      const errorLogs = [];
+      page.on("pageerror", (error) => {
+        errorLogs.push(error.message);
+      });
+
+      const chartPath = path.join(outputDir, `${chartType}_1.html`);
+      expect(fs.statSync(chartPath).size).toBeLessThan(MAX_PAGE_BYTES);
+
+      await page.goto("file://" + chartPath);
+      await page.waitForFunction(() => window.mpld3 && window.mpld3.figures.length > 0);
+      const coarse = await page.evaluate(drawnPoints, kind);
+      expect(coarse.length).toBeGreaterThan(0);
+
+      // Zoom in as TC05 does: box zoom binds mouse wheel zooming to the axes.
+      const chartArea = page.locator(".mpld3-figure");
+      await chartArea.hover();
+      const boxzoomButton = page.locator(".mpld3-boxzoombutton");
+      await expect(boxzoomButton).toBeVisible();
+      await boxzoomButton.click();
+      await expect(boxzoomButton).toHaveClass(/active/);
+
+      const axes = await page.locator(".mpld3-axesbg").boundingBox();
+      await page.mouse.move(axes.x + axes.width / 2, axes.y + axes.height / 2);
+      for (let i = 0; i < 3; i++) {
+        await page.mouse.wheel(0, -500); // each step zooms in 2x
+      }
+      await expect
+        .poll(() => page.evaluate(() => d3.zoomTransform(document.querySelector(".mpld3-axes")).k))
+        .toBeGreaterThanOrEqual(4);
+
+      // Without the plugin the view would only hold the coarse points inside it.
+      const coarseInView = await page.evaluate(countInView, { points: coarse, kind });
+      await expect
+        .poll(async () => {
+          const points = await page.evaluate(drawnPoints, kind);
+          return page.evaluate(countInView, { points, kind });
+        })
+        .toBeGreaterThan(2 * coarseInView);
+
+      expect(errorLogs.length).toBe(0);
+    });
+  });
+}
@@ -0,0 +1,77 @@
+// Tescase ID: TC15
+// Testcase Name: Canvas scatter plots
+// Description: Verify that a scatter plot exported with `--scatter-canvas` draws its points on a canvas and still loads like any chart
+// Input: A scatter plot above the canvas threshold generated with --scatter-canvas
+// Expected: The page loads without errors with its chart and toolbar SVGs and title, and the canvas holds every point and paints them
+const { test, expect } = require("@playwright/test");
+const fs = require("fs");
+const path = require("path");
+import { generateCharts } from "./generate";
+import { canvasPoints } from "./testData";
+
+const SIZE = 100000;
+const THRESHOLD = 10000;
+
+let chartUrl;
+let testData;
+
+test.beforeAll(() => {
+  test.setTimeout(120000);
+  const { outputDir, dataDir } = generateCharts("canvas", [
+    "--charts", "scatter_plot",
+    "--sizes", String(SIZE),
+    "--scatter-canvas", String(THRESHOLD),
+  ]);
+  chartUrl = "file://" + path.join(outputDir, "scatter_plot_1.html");
+  testData = JSON.parse(fs.readFileSync(path.join(dataDir, "scatter_plot_1.json"), "utf-8"));
+});
+
+test.describe("scatter_plot - canvas", () => {
+  test("TC15[scatter_plot]: page loads without errors (TC01)", async ({ page }) => {
+    const errorLogs = [];
+    page.on("pageerror", (error) => {
+      errorLogs.push(error.message);
+    });
+
+    await page.goto(chartUrl);
+    // one for chart and one for toolbar; the canvas is not an SVG
+    await expect(page.locator("svg")).toHaveCount(2);
+    await page.waitForLoadState("load");
+
+    expect(errorLogs.length).toBe(0);
+  });
+
+  test("TC15[scatter_plot]: chart title is visible (TC02)", async ({ page }) => {
+    await page.goto(chartUrl);
+    await expect(page.locator("text=Scatter Plot").first()).toBeVisible();
+  });
+
+  test("TC15[scatter_plot]: canvas holds and paints every point", async ({ page }) => {
+    expect(testData.canvas.points).toBe(SIZE);
+
+    await page.goto(chartUrl);
+    await page.waitForFunction(() => window.mpld3 && window.mpld3.figures.length > 0);
+
+    // The points are drawn on the canvas instead of as one SVG path each.
+    await expect(page.locator(".mpld3-scattercanvas canvas")).toHaveCount(1);
+    await expect(page.locator(".mpld3-paths path")).toHaveCount(0);
+
+    const points = await canvasPoints(page);
+    expect(points.length).toBe(testData.x.length);
+    for (let i = 0; i < points.length; i += 997) {
+      expect(points[i][0]).toBeCloseTo(testData.x[i], 5);
+      expect(points[i][1]).toBeCloseTo(testData.y[i], 5);
+    }
+
+    const painted = await page.evaluate(() => {
+      const canvas = document.querySelector(".mpld3-scattercanvas canvas");
+      const { data } = canvas.getContext("2d").getImageData(0, 0, canvas.width, canvas.height);
+      let count = 0;
+      for (let i = 3; i < data.length; i += 4) {
+        if (data[i] > 0) count++;
+      }
+      return count;
+    });
+    expect(painted).toBeGreaterThan(0);
+  });
+});
@@ -0,0 +1,22 @@
+const { execFileSync } = require("child_process");
+const fs = require("fs");
+const os = require("os");
+const path = require("path");
+
+const repoRoot = path.join(__dirname, "..");
+
+// Generate charts with extra generator options (e.g. `--pyramid`) into a new
+// temporary folder, so that specs covering an export option do not depend on
+// how output/ and test_data/ were generated. Returns the two folders.
+export function generateCharts(name, args) {
+  const dir = fs.mkdtempSync(path.join(os.tmpdir(), `charts-${name}-`));
+  const outputDir = path.join(dir, "output");
+  const dataDir = path.join(dir, "test_data");
+  execFileSync(
+    "python",
+    [path.join("charts", "generate.py"), "--workers", "1",
+     "--output-dir", outputDir, "--data-dir", dataDir, ...args],
+    { cwd: repoRoot }
+  );
+  return { outputDir, dataDir };
+}
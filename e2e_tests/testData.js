@@ -0,0 +1,100 @@
+const fs = require("fs");
+const path = require("path");
+
+const testDataDir = path.join(__dirname, "../test_data");
+
+const ARRAY_TYPES = { "<f8": Float64Array, "<f4": Float32Array };
+
+// Convert IEEE half floats (e.g. a float16 heatmap matrix) to a Float32Array.
+function halfToFloat(halves) {
+  const values = new Float32Array(halves.length);
+  for (let i = 0; i < halves.length; i++) {
+    const h = halves[i];
+    const sign = h & 0x8000 ? -1 : 1;
+    const exponent = (h >> 10) & 0x1f;
+    const fraction = h & 0x3ff;
+    if (exponent === 0) {
+      values[i] = sign * 2 ** -14 * (fraction / 1024);
+    } else if (exponent === 0x1f) {
+      values[i] = fraction ? NaN : sign * Infinity;
+    } else {
+      values[i] = sign * 2 ** (exponent - 15) * (1 + fraction / 1024);
+    }
+  }
+  return values;
+}
+
+// View one array entry of a binary sidecar header as a typed array of its
+// dtype (or a nested array of rows for 2D data) without parsing the values.
+function viewArray(blob, entry) {
+  let values;
+  if (entry.dtype === "<f2") {
+    values = halfToFloat(new Uint16Array(blob.buffer, blob.byteOffset + entry.offset, entry.nbytes / 2));
+  } else {
+    const ArrayType = ARRAY_TYPES[entry.dtype] || Float64Array;
+    values = new ArrayType(blob.buffer, blob.byteOffset + entry.offset,
+                           entry.nbytes / ArrayType.BYTES_PER_ELEMENT);
+  }
+  const length = values.length;
+  if (entry.shape.length < 2) {
+    return values;
+  }
+  const rowLength = entry.shape[entry.shape.length - 1];
+  return Array.from({ length: length / rowLength }, (_, i) =>
+    values.subarray(i * rowLength, (i + 1) * rowLength)
+  );
+}
+
+// Load the test data of a chart, preferring the binary sidecar
+// (<chart>_<variant>.bin.json + .bin) over the JSON file when it exists.
+// Returns null when neither exists.
+export function loadTestData(chartType, variant) {
+  const stem = path.join(testDataDir, `${chartType}_${variant}`);
+  if (fs.existsSync(`${stem}.bin.json`)) {
+    const header = JSON.parse(fs.readFileSync(`${stem}.bin.json`, "utf-8"));
+    let blob = fs.readFileSync(path.join(testDataDir, header.blob));
+    if (blob.byteOffset % 8 !== 0) {
+      // Small files can come from Node's shared buffer pool at any offset.
+      blob = new Uint8Array(blob);
+    }
+    const testData = { ...header.values };
+    for (const [key, entry] of Object.entries(header.arrays)) {
+      testData[key] = Array.isArray(entry)
+        ? entry.map((e) => viewArray(blob, e))
+        : viewArray(blob, entry);
+    }
+    return testData;
+  }
+  if (fs.existsSync(`${stem}.json`)) {
+    return JSON.parse(fs.readFileSync(`${stem}.json`, "utf-8"));
+  }
+  return null;
+}
+
+// Values of `key` as they were drawn in the HTML chart. When the generator
+// downsampled the chart (`--downsample`, `--pyramid`), the test data keeps every point and
+// records the indices that were exported in `exported_indices`.
+export function exportedValues(testData, key) {
+  if (!testData.reduction) {
+    return testData[key];
+  }
+  return Array.from(testData.exported_indices, (i) => testData[key][i]);
+}
+
+// Base64 of the image written by a raster heatmap export (`--heatmap-raster`).
+export function rasterImageBase64(testData) {
+  return fs.readFileSync(path.join(testDataDir, testData.raster.image)).toString("base64");
+}
+
+// Points of a scatter plot drawn by the canvas plugin (`--scatter-canvas`), as
+// [x, y] rows like mpld3's own data table.
+export async function canvasPoints(page) {
+  return page.evaluate(() => {
+    const plugin = window.mpld3.figures[0].plugins.find((p) => p.props.type === "scattercanvas");
+    const rows = [];
+    for (let i = 0; i < plugin.points.length; i += 2) {
+      rows.push([plugin.points[i], plugin.points[i + 1]]);
+    }
+    return rows;
+  });
+}
@@ -1,17 +1,133 @@
-const { exec } = require('child_process');
-const fs = require('fs');
+const { spawn } = require('child_process');
+const os = require('os');
 const path = require('path');
+const readline = require('readline');
 
-const chartFiles = fs.readdirSync('./charts')
-  .filter(file => file.endsWith('.py'))
-  .map(file => path.join('charts', file));
+// Charts are built by long-lived Python workers (charts/worker.py) that import
+// NumPy, matplotlib and mpld3 once and then take chart jobs as JSON lines, so
+// no job pays for interpreter startup.  Arguments are passed on to every
+// worker and take the options of charts/generate.py, for example
+//   npm run generate-charts -- --charts line_chart,heatmap --workers 4
+const WORKER_SCRIPT = path.join('charts', 'worker.py');
 
-chartFiles.forEach(file => {
-  exec(`python "${file}"`, (error, stdout, stderr) => {
-    if (error) {
-      console.error(`Error running ${file}:\n`, stderr);
+// One worker per core unless --workers says otherwise ('auto' is one per core
+// too, as for run_unit_test.py).  The option is the driver's own, so it is
+// taken out of the arguments passed on to the workers.
+function workerOptions(args) {
+  const workerArgs = [];
+  let value = 'auto';
+  for (let i = 0; i < args.length; i++) {
+    if (args[i] === '--workers') {
+      value = args[++i];
+    } else if (args[i].startsWith('--workers=')) {
+      value = args[i].slice('--workers='.length);
     } else {
-      console.log(`Output from ${file}:\n`, stdout);
+      workerArgs.push(args[i]);
     }
-  });
+  }
+  const count = value === 'auto' ? os.cpus().length : Number(value);
+  if (!Number.isInteger(count) || count < 1) {
+    throw new Error(`--workers must be a positive integer or 'auto', not ${JSON.stringify(value)}`);
+  }
+  return { count, workerArgs };
+}
+
+class Worker {
+  constructor(args) {
+    this.process = spawn('python', [WORKER_SCRIPT, ...args], { stdio: ['pipe', 'pipe', 'inherit'] });
+    this.pending = new Map();
+    this.nextId = 0;
+    this.alive = true;
+    this.ready = new Promise((resolve, reject) => {
+      this.pending.set('ready', { resolve, reject });
+    });
+    this.ready.catch(() => {});  // a worker closed before it started is not an error
+
+    readline.createInterface({ input: this.process.stdout }).on('line', line => {
+      let message;
+      try {
+        message = JSON.parse(line);
+      } catch (error) {
+        console.log(line);  // --help, for instance
+        return;
+      }
+      const key = message.ready ? 'ready' : message.id;
+      const request = this.pending.get(key);
+      if (!request) return;
+      this.pending.delete(key);
+      if (message.error) {
+        request.reject(new Error(message.error));
+      } else {
+        request.resolve(message);
+      }
+    });
+
+    this.process.on('error', error => this.fail(error));
+    this.process.on('exit', code => this.fail(new Error(`worker exited with code ${code}`)));
+  }
+
+  fail(error) {
+    this.alive = false;
+    for (const request of this.pending.values()) request.reject(error);
+    this.pending.clear();
+  }
+
+  async request(message) {
+    await this.ready;
+    const id = this.nextId++;
+    return new Promise((resolve, reject) => {
+      this.pending.set(id, { resolve, reject });
+      this.process.stdin.write(JSON.stringify({ id, ...message }) + '\n');
+    });
+  }
+
+  close() {
+    if (this.alive) this.process.stdin.end();
+  }
+}
+
+async function main() {
+  const { count, workerArgs } = workerOptions(process.argv.slice(2));
+  // Start every worker at once so that they warm up in parallel.
+  const workers = Array.from({ length: count }, () => new Worker(workerArgs));
+  try {
+    const [planner] = workers;
+    const { jobs } = await planner.request({ op: 'plan' });
+    workers.splice(Math.max(1, jobs.length)).forEach(worker => worker.close());
+
+    const results = new Array(jobs.length);
+    let next = 0;
+    let failed = 0;
+    // Each worker takes the next job as soon as it is done with its last one.
+    await Promise.all(workers.map(async worker => {
+      while (worker.alive && next < jobs.length) {
+        const index = next++;
+        const [chartType, version] = jobs[index];
+        try {
+          const result = await worker.request({ op: 'run', job: jobs[index] });
+          results[index] = result;
+          const status = result.cached ? 'Up to date' : `Rendered in ${result.seconds.toFixed(2)}s`;
+          console.log(`${chartType}_${version}: ${status} (worker ${worker.process.pid})`);
+        } catch (error) {
+          failed++;
+          console.error(`Error generating ${chartType}_${version}:\n`, error.message);
+        }
+      }
+    }));
+    if (next < jobs.length) throw new Error('every worker exited before the last job');
+
+    const { summary } = await planner.request({ op: 'finish', results: results.filter(Boolean) });
+    summary.forEach(line => console.log(line));
+    if (failed) {
+      console.error(`${failed} of ${jobs.length} charts failed.`);
+      process.exitCode = 1;
+    }
+  } finally {
+    workers.forEach(worker => worker.close());
+  }
+}
+
+main().catch(error => {
+  console.error('Error running the chart workers:\n', error.message);
+  process.exitCode = 1;
 });
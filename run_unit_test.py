@@ -1,24 +1,83 @@
 import os
+import sys
+import json
+import time
+import argparse
 import subprocess
+from importlib.util import find_spec
 
 import matplotlib
-matplotlib.use('Agg') 
-# Create output folder
-os.makedirs("unit_test_report", exist_ok=True)
+matplotlib.use('Agg')
 import glob
 
-test_files = glob.glob("unit_tests/test_*.py")
-# Run pytest with HTML report and coverage
-subprocess.run(
-    [
-        "python",
+REPORT_DIR = "unit_test_report"
+# Wall-clock time of the last run in each mode, to report the speedup
+TIMINGS_PATH = os.path.join(REPORT_DIR, "timings.json")
+
+
+def coverage_source():
+    # CI installs the matplotlib under test into ./matplotlib (see README);
+    # otherwise cover the installed copy the tests import.
+    vendored = os.path.join("matplotlib", "matplotlib")
+    if os.path.isdir(vendored):
+        return vendored
+    return os.path.dirname(find_spec("matplotlib").origin)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the unit tests with HTML and coverage reports.")
+    parser.add_argument("-n", "--workers", metavar="N",
+                        help="run on N pytest-xdist worker processes ('auto': one per CPU)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Create output folder
+    os.makedirs(REPORT_DIR, exist_ok=True)
+
+    test_files = sorted(glob.glob("unit_tests/test_*.py"))
+    command = [
+        sys.executable,
         "-m",
         "pytest",
         *test_files,
-        "--html=unit_test_report/index.html",
+        f"--html={REPORT_DIR}/index.html",
         "--self-contained-html",
-        "--cov=matplotlib/matplotlib/",  # specify folder to check coverage
+        f"--cov={coverage_source()}",  # specify folder to check coverage
         "--cov-report=term",  # show summary in terminal
-        "--cov-report=html:unit_test_report/cov",  # generate HTML report
+        f"--cov-report=html:{REPORT_DIR}/cov",  # generate HTML report
     ]
-)
+    if args.workers:
+        # Idle workers steal queued tests from busy ones, and unit_tests/conftest.py
+        # deals the slowest tests of the last run evenly across the workers'
+        # queues.  pytest-cov and pytest-html combine the workers' coverage
+        # data and results.
+        command += ["-n", args.workers, "--dist", "worksteal"]
+
+    # Run pytest with HTML report and coverage
+    start = time.perf_counter()
+    subprocess.run(command)
+    elapsed = time.perf_counter() - start
+
+    mode = f"workers={args.workers}" if args.workers else "serial"
+    try:
+        with open(TIMINGS_PATH) as f:
+            timings = json.load(f)
+    except (OSError, ValueError):
+        timings = {}
+    timings[mode] = elapsed
+    with open(TIMINGS_PATH, "w") as f:
+        json.dump(timings, f, indent=2)
+
+    print(f"Unit tests took {elapsed:.1f}s ({mode}).")
+    if args.workers:
+        if "serial" in timings:
+            print(f"Speedup over the last serial run ({timings['serial']:.1f}s): "
+                  f"{timings['serial'] / elapsed:.2f}x")
+        else:
+            print("Run without --workers once to measure the speedup.")
+
+
+if __name__ == "__main__":
+    main()
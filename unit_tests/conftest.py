@@ -0,0 +1,102 @@
+"""Session-wide cache of the figures built by the tests and their renders.
+
+``render_cache.figure(generator, *args, **kwargs)`` returns the figure that
+``generator`` builds from those arguments, building it only the first time
+the same generator is called with equal arguments anywhere in the session;
+``render_cache.png(...)`` does the same for the figure's PNG bytes.  Tests
+sharing a case therefore share one figure and one render and only check
+different attributes of it, so they must not modify the figure.  Cached
+figures are kept until the session ends, so the cache is only for cases
+that several tests share, such as the registry figures of ``test_builders``
+and ``test_render``; a case checked by one test builds its own figure.
+
+matplotlib is not imported here: the chart test modules put their own copy
+of it on ``sys.path`` first.
+"""
+import pickle
+from io import BytesIO
+
+import pytest
+
+
+class RenderCache:
+    """Memo of ``generator(*args, **kwargs)`` figures and their PNG renders."""
+
+    def __init__(self):
+        self.figures = {}
+        self.renders = {}
+
+    @staticmethod
+    def _key(generator, args, kwargs):
+        # Test cases are lists, tuples and arrays of numbers and strings.
+        return (generator.__module__, generator.__qualname__,
+                pickle.dumps((args, sorted(kwargs.items()))))
+
+    def figure(self, generator, *args, **kwargs):
+        key = self._key(generator, args, kwargs)
+        if key not in self.figures:
+            self.figures[key] = generator(*args, **kwargs)
+        return self.figures[key]
+
+    def png(self, generator, *args, **kwargs):
+        key = self._key(generator, args, kwargs)
+        if key not in self.renders:
+            buf = BytesIO()
+            self.figure(generator, *args, **kwargs).savefig(buf, format="png")
+            self.renders[key] = buf.getvalue()
+        return self.renders[key]
+
+    def clear(self):
+        self.figures.clear()
+        self.renders.clear()
+
+
+@pytest.fixture(scope="session")
+def render_cache():
+    cache = RenderCache()
+    yield cache
+    cache.clear()
+
+
+# -------- Cost-aware ordering for parallel runs --------
+# Test durations of the last run are kept in the pytest cache.  The
+# ``worksteal`` scheduler of pytest-xdist splits the collected tests into one
+# contiguous block per worker (the shorter blocks first) and later moves
+# queued tests, by count, from busy workers to idle ones.  So the tests are
+# sorted slowest first and dealt round-robin into one block per worker: every
+# worker starts on an equal share of the slow tests, runs its cheap ones
+# last, and only those cheap ones get stolen.  Every worker collects the same
+# order, as xdist requires, since they all read the same cache.
+DURATIONS_KEY = "unit_tests/durations"
+
+
+def pytest_collection_modifyitems(config, items):
+    cache = getattr(config, "cache", None)
+    if cache is None or not hasattr(config, "workerinput"):
+        return
+    durations = cache.get(DURATIONS_KEY, {})
+    items.sort(key=lambda item: -durations.get(item.nodeid, 0.0))
+    workers = config.workerinput["workercount"]
+    blocks = sorted((items[i::workers] for i in range(workers)), key=len)
+    items[:] = [item for block in blocks for item in block]
+
+
+class DurationRecorder:
+    """Add up the setup, call and teardown time of every test."""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.durations = {}
+
+    def pytest_runtest_logreport(self, report):
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+
+    def pytest_sessionfinish(self):
+        if self.durations:
+            self.cache.set(DURATIONS_KEY, {**self.cache.get(DURATIONS_KEY, {}), **self.durations})
+
+
+def pytest_configure(config):
+    # Recorded by the controller (or a serial run), which sees every report.
+    if getattr(config, "cache", None) is not None and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(DurationRecorder(config.cache), "unit-test-durations")
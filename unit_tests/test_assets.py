@@ -0,0 +1,36 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from charts import assets, generate
+from charts.registry import Job
+
+
+def test_install_copies_libraries_once(tmp_path):
+    urls = assets.install(str(tmp_path))
+    assert set(urls) == {"d3_url", "mpld3_url"}
+    for keyword, source in assets.library_files().items():
+        target = tmp_path / urls[keyword]
+        assert target.read_bytes() == open(source, "rb").read()
+
+    mtime = os.path.getmtime(tmp_path / urls["d3_url"])
+    assert assets.install(str(tmp_path)) == urls
+    assert os.path.getmtime(tmp_path / urls["d3_url"]) == mtime
+
+
+def test_pages_reference_local_assets(tmp_path):
+    out, data = str(tmp_path / "output"), str(tmp_path / "test_data")
+    jobs = [Job("line_chart", 1, 10)]
+    (local,) = generate.generate(jobs, output_dir=out, data_dir=data)
+    html = open(local.html_path).read()
+    assert "assets/mpld3.v" in html and "d3js.org" not in html
+    assert os.path.isdir(os.path.join(out, "assets"))
+
+    (cdn,) = generate.generate(jobs, output_dir=out, data_dir=data, local_assets=False)
+    assert not cdn.cached and cdn.digest != local.digest
+    assert "d3js.org" in open(cdn.html_path).read()
@@ -7,7 +7,8 @@ sys.path.insert(
 )
 
 import pytest
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import matplotlib
 
 matplotlib.use("Agg")  # Use non-interactive backend for testing
@@ -24,7 +25,9 @@ def generate_vertical_bar_chart(data, labels, title="Vertical Bar Chart"):
     if not data or not labels:
         raise ValueError("Data and labels cannot be empty.")
 
-    fig, ax = plt.subplots()
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
     ax.bar(labels, data)
     ax.set_title(title)
     return fig
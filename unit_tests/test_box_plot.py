@@ -7,7 +7,8 @@ sys.path.insert(
 )
 
 import pytest
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import matplotlib
 
 matplotlib.use("Agg")  # Use non-interactive backend for testing
@@ -26,7 +27,9 @@ def generate_box_plot(data, labels, title="Box Plot Chart"):
     if not all(isinstance(d, (list, tuple)) for d in data):
         raise TypeError("Each item in data must be a list or tuple of numbers.")
 
-    fig, ax = plt.subplots()
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
     ax.boxplot(data, labels=labels)
     ax.set_title(title)
     return fig
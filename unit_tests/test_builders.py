@@ -0,0 +1,47 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import pytest
+
+from charts.builders import build_figure
+from charts.registry import CHART_REGISTRY, iter_jobs, job_rng
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def build_and_render(job):
+    spec = CHART_REGISTRY[job.chart_type]
+    fig = build_figure(job.chart_type, spec.make_data(job.size, job_rng(job)))
+    buf = BytesIO()
+    fig.savefig(buf, format="png")
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("chart_type", list(CHART_REGISTRY))
+def test_build_figure(chart_type, render_cache):
+    spec = CHART_REGISTRY[chart_type]
+    job = next(iter_jobs([chart_type]))
+    fig = render_cache.figure(build_figure, chart_type, spec.make_data(job.size, job_rng(job)))
+    assert fig.axes[0].name == ("polar" if spec.projection == "polar" else "rectilinear")
+    assert fig.axes[0].get_title()
+
+
+def test_concurrent_rendering_matches_serial():
+    jobs = list(iter_jobs()) * 2
+    serial = [build_and_render(job) for job in jobs]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        threaded = list(executor.map(build_and_render, jobs))
+    assert threaded == serial
+
+
+@pytest.mark.parametrize("module", ["charts.builders", "charts.figpool", "charts.generate"])
+def test_import_does_not_load_pyplot(module):
+    code = f"import sys, {module}; sys.exit('matplotlib.pyplot' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT)
+    assert result.returncode == 0
@@ -0,0 +1,47 @@
+import json
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from charts import bundle, generate
+from charts.registry import iter_jobs
+
+
+def test_bundles_hold_every_chart_page(tmp_path):
+    out, data = str(tmp_path / "output"), str(tmp_path / "test_data")
+    jobs = list(iter_jobs(["line_chart", "heatmap", "pie_chart"]))
+    results = generate.generate(jobs, output_dir=out, data_dir=data, bundle_size=4)
+
+    directory = os.path.join(out, bundle.BUNDLES_DIR)
+    with open(os.path.join(directory, bundle.MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    assert [b["file"] for b in manifest["bundles"]] == ["bundle_1.html", "bundle_2.html"]
+    ids = [chart["id"] for b in manifest["bundles"] for chart in b["charts"]]
+    assert ids == [f"{job.chart_type}_{job.version}" for job in jobs]
+
+    pages = {r.html_path for r in results}
+    for b in manifest["bundles"]:
+        with open(os.path.join(directory, b["file"])) as f:
+            text = f.read()
+        # The libraries are loaded once, from the shared assets.
+        assert text.count("<script src=") == 2 and "../assets/d3.v5.min.js" in text
+        assert re.findall(r'<div class="chart" id="(\w+)"', text) == [c["id"] for c in b["charts"]]
+        for chart in b["charts"]:
+            page = os.path.join(out, f"{chart['id']}.html")
+            assert page in pages and open(page).read() in text
+
+
+def test_bundles_replace_previous_run(tmp_path):
+    out, data = str(tmp_path / "output"), str(tmp_path / "test_data")
+    jobs = list(iter_jobs(["line_chart", "pie_chart"]))
+    generate.generate(jobs, output_dir=out, data_dir=data, bundle_size=1)
+    generate.generate(jobs, output_dir=out, data_dir=data, bundle_size=3)
+    assert sorted(os.listdir(os.path.join(out, bundle.BUNDLES_DIR))) == [
+        "bundle_1.html", "bundle_2.html", "bundles.json",
+    ]
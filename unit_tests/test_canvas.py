@@ -0,0 +1,53 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import base64
+import json
+
+import numpy as np
+
+import charts.builders  # noqa: F401
+from charts import canvas, generate
+from charts.figpool import new_figure
+from charts.registry import CHART_REGISTRY, iter_jobs
+
+
+def figure_json(html):
+    start = html.index("{", html.index("draw_figure("))
+    return json.JSONDecoder().raw_decode(html[start:])[0]
+
+
+def test_attach_keeps_axes_limits():
+    rng = np.random.default_rng(0)
+    data = {"x": rng.random(500) * 4, "y": rng.random(500) - 2}
+    expected = new_figure()
+    CHART_REGISTRY["scatter_plot"].draw(expected.axes[0], data)
+    fig = new_figure()
+    CHART_REGISTRY["scatter_plot"].draw(fig.axes[0], data)
+
+    plugin = canvas.attach(fig, data["x"], data["y"])
+    assert not fig.axes[0].collections
+    assert fig.axes[0].get_xlim() == expected.axes[0].get_xlim()
+    assert fig.axes[0].get_ylim() == expected.axes[0].get_ylim()
+    assert plugin.dict_["count"] == 500 and plugin.dict_["color"] == "#1f77b4"
+
+    points = np.frombuffer(base64.b64decode(plugin.data["points"]), dtype="<f4").reshape(-1, 2)
+    assert np.allclose(points, np.column_stack([data["x"], data["y"]]), atol=1e-6)
+
+
+def test_generate_scatter_canvas(tmp_path):
+    out, data_dir = tmp_path / "output", tmp_path / "test_data"
+    jobs = iter_jobs(["scatter_plot"], {"scatter_plot": [10, 5000]})
+    generate.generate(jobs, output_dir=str(out), data_dir=str(data_dir), scatter_canvas=1000)
+
+    small, large = ((out / f"scatter_plot_{v}.html").read_text() for v in (1, 2))
+    assert "scattercanvas" not in small
+    fig = figure_json(large)
+    assert fig["axes"][0]["collections"] == [] and fig["data"] == {}
+    assert [p["type"] for p in fig["plugins"]][-1] == "scattercanvas"
+    # The packed points are written once, not in each copy of the figure JSON.
+    assert large.count("mpld3PluginData = window.mpld3PluginData") == 1
+    with open(data_dir / "scatter_plot_2.json") as f:
+        assert json.load(f)["canvas"] == {"points": 5000}
@@ -0,0 +1,78 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+
+import pytest
+import numpy as np
+
+from charts import generate
+from charts.downsample import lttb, minmax, reduce_points
+from charts.registry import iter_jobs
+
+
+def signal(n=10000):
+    x = np.linspace(0, 10, n)
+    y = np.sin(x)
+    y[n // 3] = 5.0  # a single spike
+    return x, y
+
+
+def test_lttb_keeps_endpoints_and_order():
+    x, y = signal()
+    indices = lttb(x, y, 200)
+    assert len(indices) == 200
+    assert indices[0] == 0 and indices[-1] == len(x) - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_lttb_keeps_spike():
+    x, y = signal()
+    assert len(x) // 3 in lttb(x, y, 200)
+
+
+def test_lttb_short_input_is_unchanged():
+    x, y = signal(50)
+    assert np.array_equal(lttb(x, y, 100), np.arange(50))
+    with pytest.raises(ValueError):
+        lttb(*signal(), 2)
+
+
+def test_minmax_keeps_global_extremes():
+    x, y = signal()
+    indices = minmax(x, y, 100)
+    assert len(indices) <= 202
+    assert np.argmax(y) in indices and np.argmin(y) in indices
+    assert indices[0] == 0 and indices[-1] == len(x) - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_reduce_points_respects_budget(method):
+    x, y = signal()
+    assert len(reduce_points(x, y, 300, method)) <= 300
+
+
+def test_reduce_points_unknown_method():
+    with pytest.raises(ValueError):
+        reduce_points(*signal(), 100, method="every-nth")
+
+
+def test_generate_records_reduction(tmp_path):
+    out, data = tmp_path / "output", tmp_path / "test_data"
+    jobs = iter_jobs(["line_chart", "polar_plot"], {"line_chart": [10, 100000], "polar_plot": [100]})
+    generate.generate(jobs, output_dir=str(out), data_dir=str(data), downsample="lttb")
+
+    with open(data / "line_chart_2.json") as f:
+        reduced = json.load(f)
+    assert len(reduced["x"]) == 100000
+    assert reduced["reduction"]["method"] == "lttb"
+    assert reduced["reduction"]["original_points"] == 100000
+    assert len(reduced["exported_indices"]) == reduced["reduction"]["exported_points"] < 2000
+
+    # Charts that already fit the axes width are exported as is.
+    for name in ("line_chart_1", "polar_plot_1"):
+        with open(data / f"{name}.json") as f:
+            assert "reduction" not in json.load(f)
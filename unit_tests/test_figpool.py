@@ -0,0 +1,92 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from io import BytesIO
+
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import charts.builders  # noqa: F401
+from charts.figpool import FigurePool
+from charts.registry import CHART_REGISTRY, Job, job_rng
+
+
+def render(fig):
+    buf = BytesIO()
+    fig.savefig(buf, format="png")
+    return buf.getvalue()
+
+
+def chart_data(chart_type):
+    spec = CHART_REGISTRY[chart_type]
+    return spec.make_data(spec.sizes[-1], job_rng(Job(chart_type, 2, spec.sizes[-1])))
+
+
+def draw_fresh(chart_type):
+    spec = CHART_REGISTRY[chart_type]
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    spec.draw(fig.add_subplot(projection=spec.projection), chart_data(chart_type))
+    return render(fig)
+
+
+@pytest.mark.parametrize("chart_type", list(CHART_REGISTRY))
+def test_reused_figure_renders_like_a_new_one(chart_type):
+    spec = CHART_REGISTRY[chart_type]
+    pool = FigurePool()
+    # Dirty the pooled figure with every other chart of the same projection first.
+    for other in CHART_REGISTRY.values():
+        if other.projection == spec.projection and other.chart_type != chart_type:
+            with pool.figure(other.projection) as fig:
+                other.draw(fig.axes[0], chart_data(other.chart_type))
+                render(fig)
+
+    with pool.figure(spec.projection) as fig:
+        spec.draw(fig.axes[0], chart_data(chart_type))
+        assert render(fig) == draw_fresh(chart_type)
+    assert pool.misses == 1
+
+
+def test_pool_is_keyed_by_projection():
+    pool = FigurePool()
+    with pool.figure() as cartesian:
+        assert cartesian.axes[0].name == "rectilinear"
+    with pool.figure("polar") as polar:
+        assert polar.axes[0].name == "polar"
+    with pool.figure() as again:
+        assert again is cartesian
+    assert pool.stats() == {"hits": 1, "misses": 2}
+
+
+def test_release_removes_artists():
+    pool = FigurePool()
+    with pool.figure() as fig:
+        ax = fig.axes[0]
+        ax.bar([1, 2], [3, 4], label="A")
+        ax.legend()
+        fig.colorbar(ax.imshow([[1, 2], [3, 4]]))
+        ax.set_title("Title")
+    assert len(fig.axes) == 1
+    assert not ax.patches and not ax.images and ax.get_legend() is None
+    assert ax.get_title() == ""
+
+
+def test_figures_with_unit_converters_are_discarded():
+    pool = FigurePool()
+    with pool.figure() as fig:
+        fig.axes[0].plot(["a", "b"], [1, 2])
+    with pool.figure() as other:
+        assert other is not fig
+    assert pool.stats() == {"hits": 0, "misses": 2}
+
+
+def test_pool_size_is_bounded():
+    pool = FigurePool(maxsize=1)
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    pool.release(second)
+    assert pool.acquire() is first
+    assert pool.acquire() is not second
@@ -0,0 +1,294 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import re
+import shutil
+import subprocess
+
+import pytest
+import matplotlib
+
+matplotlib.use("Agg")
+
+from charts import generate
+from charts.cache import OutputCache, content_hash
+from charts.registry import (
+    CHART_REGISTRY, Job, iter_jobs, job_rng, load_size_config, parse_sizes,
+)
+
+
+def test_registry_has_all_chart_types():
+    assert list(CHART_REGISTRY) == [
+        "line_chart",
+        "bar_chart",
+        "horizontal_bar_chart",
+        "pie_chart",
+        "scatter_plot",
+        "histogram",
+        "box_plot",
+        "area_chart",
+        "stem_plot",
+        "heatmap",
+        "stacked_bar_chart",
+        "polar_plot",
+    ]
+
+
+def test_iter_jobs_order():
+    jobs = list(iter_jobs(["pie_chart", "line_chart"]))
+    assert jobs == [
+        ("pie_chart", 1, 4),
+        ("pie_chart", 2, 8),
+        ("line_chart", 1, 10),
+        ("line_chart", 2, 100),
+    ]
+
+
+def test_iter_jobs_size_overrides():
+    sizes = parse_sizes(["line_chart=10,100,10000", "7"])
+    assert sizes == {"line_chart": [10, 100, 10000], "*": [7]}
+    jobs = list(iter_jobs(["line_chart", "bar_chart"], sizes))
+    assert jobs == [
+        ("line_chart", 1, 10),
+        ("line_chart", 2, 100),
+        ("line_chart", 3, 10000),
+        ("bar_chart", 1, 7),
+    ]
+
+
+def test_load_size_config(tmp_path):
+    config = tmp_path / "sizes.json"
+    config.write_text('{"heatmap": [5, 20, 2000]}')
+    assert load_size_config(str(config)) == {"heatmap": [5, 20, 2000]}
+
+
+@pytest.mark.parametrize("bad_sizes", [["line_chart=ten"], ["1,x"]])
+def test_parse_sizes_invalid(bad_sizes):
+    with pytest.raises(ValueError):
+        parse_sizes(bad_sizes)
+
+
+def test_iter_jobs_unknown_chart_type():
+    with pytest.raises(ValueError):
+        list(iter_jobs(["not_a_chart"]))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_generate_writes_outputs_in_job_order(tmp_path, workers):
+    out, data = tmp_path / "output", tmp_path / "test_data"
+    jobs = list(iter_jobs(["line_chart", "heatmap", "polar_plot"]))
+    results = generate.generate(jobs, workers=workers, output_dir=str(out), data_dir=str(data))
+
+    assert [r.job for r in results] == jobs
+    for r in results:
+        assert os.path.basename(r.html_path) == f"{r.job.chart_type}_{r.job.version}.html"
+        assert [os.path.basename(p) for p in r.data_paths] == [f"{r.job.chart_type}_{r.job.version}.json"]
+        assert os.path.exists(r.html_path) and os.path.exists(r.data_paths[0])
+
+
+def test_unchanged_charts_are_not_rerendered(tmp_path):
+    out, data = str(tmp_path / "output"), str(tmp_path / "test_data")
+    jobs = list(iter_jobs(["line_chart", "area_chart"]))
+    first = generate.generate(jobs, output_dir=out, data_dir=data)
+    mtimes = [os.path.getmtime(r.html_path) for r in first]
+
+    second = generate.generate(jobs, output_dir=out, data_dir=data)
+    assert not any(r.cached for r in first)
+    assert all(r.cached for r in second)
+    assert [r.digest for r in first] == [r.digest for r in second]
+    assert [os.path.getmtime(r.html_path) for r in second] == mtimes
+
+    third = generate.generate(jobs, output_dir=out, data_dir=data, use_cache=False)
+    assert not any(r.cached for r in third)
+
+
+def test_cache_rebuilds_into_new_directories(tmp_path):
+    out, data = str(tmp_path / "output"), str(tmp_path / "test_data")
+    jobs = list(iter_jobs(["pie_chart"]))
+    generate.generate(jobs, output_dir=out, data_dir=data)
+
+    moved = generate.generate(jobs, output_dir=out, data_dir=str(tmp_path / "d2"))
+    assert not any(r.cached for r in moved)
+    assert all(os.path.exists(p) for r in moved for p in r.data_paths)
+    assert all(p.startswith(str(tmp_path / "d2")) for r in moved for p in r.data_paths)
+
+
+def test_changed_only_rebuilds_affected_charts(tmp_path):
+    out, data = str(tmp_path / "output"), str(tmp_path / "test_data")
+    jobs = list(iter_jobs(["pie_chart", "polar_plot"]))
+    first = generate.generate(jobs, output_dir=out, data_dir=data)
+    entry = OutputCache.load(out).entries["polar_plot_1"]
+    assert set(entry["deps"]) == {"source", "size", "seed", "options"}
+
+    again = generate.generate(jobs, output_dir=out, data_dir=data, changed_only=True)
+    assert all(r.cached and r.stats["skipped"] for r in again)
+    assert [(r.chart_paths, r.data_paths, r.digest) for r in again] == \
+        [(r.chart_paths, r.data_paths, r.digest) for r in first]
+
+    reseeded = generate.generate(jobs, output_dir=out, data_dir=data, changed_only=True, seed=1)
+    assert not any(r.stats["skipped"] for r in reseeded)
+
+
+def test_changed_only_lists_skipped_charts(tmp_path, capsys):
+    argv = ["--charts", "pie_chart", "--workers", "1", "--changed-only",
+            "--output-dir", str(tmp_path / "output"), "--data-dir", str(tmp_path / "test_data")]
+    generate.main(argv)
+    assert "Skipped 0 unchanged charts." in capsys.readouterr().out
+    generate.main(argv)
+    assert "Skipped 2 unchanged charts: pie_chart_1, pie_chart_2" in capsys.readouterr().out
+
+
+def _copy_charts(tmp_path):
+    # A scratch copy of the charts package whose modules a test may edit.
+    root = tmp_path / "src"
+    shutil.copytree(os.path.join(os.path.dirname(__file__), "..", "charts"), root / "charts",
+                    ignore=shutil.ignore_patterns("__pycache__"))
+    return root
+
+
+def _run(root, *args):
+    # Run the copy's generate.py and return its output.
+    result = subprocess.run([sys.executable, "charts/generate.py", "--workers", "1",
+                             "--output-dir", "output", "--data-dir", "test_data", *args],
+                            cwd=root, capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+def _rendered(root, *args):
+    # Run the copy's generate.py and return how many charts it rendered.
+    return int(re.search(r"Rendered (\d+) charts", _run(root, *args)).group(1))
+
+
+def test_cache_tracks_builder_source(tmp_path):
+    root = _copy_charts(tmp_path)
+    args = ("--charts", "pie_chart,polar_plot")
+    assert _rendered(root, *args) == 4
+
+    # The generator itself does not decide what a chart looks like.
+    generate_py = root / "charts" / "generate.py"
+    generate_py.write_text(generate_py.read_text().replace("Rendered {", "Built {"))
+    assert "Built 0 charts" in _run(root, *args)
+
+    builders_py = root / "charts" / "builders.py"
+    builders_py.write_text(builders_py.read_text().replace('"Polar Plot"', '"Polar"'))
+    assert "Built 2 charts" in _run(root, *args)
+
+
+def test_cache_tracks_plugin_source(tmp_path):
+    root = _copy_charts(tmp_path)
+    args = ("--charts", "scatter_plot", "--sizes", "scatter_plot=20", "--scatter-canvas", "10")
+    assert _rendered(root, *args) == 1
+    assert _rendered(root, *args) == 0
+
+    canvas_py = root / "charts" / "canvas.py"
+    js = 'JAVASCRIPT = pagedata.JAVASCRIPT + r"""'
+    canvas_py.write_text(canvas_py.read_text().replace(js, js + "\n// edited"))
+    assert _rendered(root, *args) == 1
+
+
+def test_changed_only_tracks_builder_source(tmp_path):
+    root = _copy_charts(tmp_path)
+    args = ("--charts", "pie_chart,histogram,polar_plot", "--changed-only")
+    assert _rendered(root, *args) == 6
+    assert _rendered(root, *args) == 0
+
+    # Editing the polar plot builder only rebuilds the polar plots.
+    builders_py = root / "charts" / "builders.py"
+    builders_py.write_text(builders_py.read_text().replace('"Polar Plot"', '"Polar"'))
+    output = _run(root, *args)
+    assert "Rendered 2 charts" in output
+    assert ("Skipped 4 unchanged charts: pie_chart_1, pie_chart_2, histogram_1, histogram_2"
+            in output)
+
+
+def test_changed_only_tracks_helper_source(tmp_path):
+    root = _copy_charts(tmp_path)
+    args = ("--charts", "histogram", "--changed-only")
+    assert _rendered(root, *args) == 2
+    assert _rendered(root, *args) == 0
+
+    stats_py = root / "charts" / "stats.py"
+    stats_py.write_text(stats_py.read_text().replace("bins=bins", "bins=bins * 2"))
+    assert _rendered(root, *args) == 2
+
+
+def test_cache_evicts_removed_chart_types(tmp_path):
+    out, data = str(tmp_path / "output"), str(tmp_path / "test_data")
+    os.makedirs(out)
+    stale_file = os.path.join(out, "old_chart_1.html")
+    open(stale_file, "w").close()
+    cache = OutputCache.load(out)
+    cache.record("old_chart_1", "old_chart", "0" * 64, [stale_file])
+    cache.save()
+
+    generate.generate(iter_jobs(["line_chart"]), output_dir=out, data_dir=data)
+
+    assert not os.path.exists(stale_file)
+    assert set(OutputCache.load(out).entries) == {"line_chart_1", "line_chart_2"}
+
+
+def test_content_hash_tracks_data():
+    spec = CHART_REGISTRY["scatter_plot"]
+    job = Job("scatter_plot", 1, 10)
+    data = spec.make_data(10, job_rng(job))
+    assert content_hash(data, spec.draw) == content_hash(spec.make_data(10, job_rng(job)), spec.draw)
+    data["y"] = data["y"] + 1
+    assert content_hash(data, spec.draw) != content_hash(spec.make_data(10, job_rng(job)), spec.draw)
+
+
+def test_job_rng_depends_on_seed_and_job_only():
+    job = Job("bar_chart", 2, 20)
+    assert job_rng(job).random() == job_rng(job).random()
+    assert job_rng(job).random() != job_rng(job, seed=1).random()
+    assert job_rng(job).random() != job_rng(Job("bar_chart", 1, 20)).random()
+    assert job_rng(job).random() != job_rng(Job("pie_chart", 2, 20)).random()
+
+
+def test_test_data_is_identical_across_worker_counts(tmp_path):
+    jobs = list(iter_jobs(["bar_chart", "histogram", "heatmap", "polar_plot"]))
+    runs = []
+    for workers, order in [(1, jobs), (3, jobs[::-1])]:
+        data_dir = tmp_path / f"data_{workers}"
+        generate.generate(order, workers=workers, output_dir=str(tmp_path / f"out_{workers}"),
+                          data_dir=str(data_dir), seed=7)
+        runs.append({p.name: p.read_bytes() for p in data_dir.iterdir()})
+    assert runs[0] == runs[1]
+
+
+def test_static_formats_from_one_figure(tmp_path):
+    out, data = str(tmp_path / "output"), str(tmp_path / "test_data")
+    jobs = [Job("scatter_plot", 1, 50), Job("heatmap", 1, 5)]
+    results = generate.generate(jobs, output_dir=out, data_dir=data,
+                                formats=("html", "png", "svg", "pdf"))
+    for r in results:
+        stem = os.path.join(out, f"{r.job.chart_type}_{r.job.version}")
+        assert r.chart_paths == {fmt: f"{stem}.{fmt}" for fmt in ("html", "png", "svg", "pdf")}
+        assert r.html_path == f"{stem}.html"
+        assert set(r.stats["format_seconds"]) == set(r.chart_paths)
+        with open(f"{stem}.png", "rb") as f:
+            assert f.read(4) == b"\x89PNG"
+        with open(f"{stem}.pdf", "rb") as f:
+            assert f.read(5) == b"%PDF-"
+        with open(f"{stem}.svg") as f:
+            assert "<svg" in f.read()
+
+    again = generate.generate(jobs, output_dir=out, data_dir=data,
+                              formats=("html", "png", "svg", "pdf"))
+    assert all(r.cached and r.stats["format_seconds"] == {} for r in again)
+
+
+def test_static_formats_without_html(tmp_path):
+    out, data = str(tmp_path / "output"), str(tmp_path / "test_data")
+    (result,) = generate.generate([Job("line_chart", 1, 10)], output_dir=out, data_dir=data,
+                                  formats=("png",))
+    assert result.html_path is None
+    assert sorted(os.listdir(out)) == [".manifest.json", "line_chart_1.png"]
+    assert os.path.exists(result.data_paths[0])
+
+
+def test_parse_formats():
+    assert generate.parse_args(["--formats", "html,png,html"]).formats == ("html", "png")
+    with pytest.raises(SystemExit):
+        generate.parse_args(["--formats", "html,gif"])
@@ -8,7 +8,8 @@ sys.path.insert(
 
 import pytest
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from io import BytesIO
 
 
@@ -25,7 +26,9 @@ def generate_heatmap(data, title="Heatmap", cmap="viridis", aspect="auto"):
     if data.size == 0:
         raise ValueError("Data cannot be empty.")
 
-    fig, ax = plt.subplots()
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
     cax = ax.imshow(data, cmap=cmap, aspect=aspect)
     fig.colorbar(cax)
     ax.set_title(title)
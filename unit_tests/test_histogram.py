@@ -4,7 +4,8 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../matplotlib")))
 
 import pytest
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import matplotlib
 
 matplotlib.use("Agg")
@@ -18,7 +19,9 @@ def generate_histogram_chart(data, bins, title="Histogram Chart"):
         raise ValueError("Data cannot be empty.")
     if bins <= 0:
         raise ValueError("Bins must be a positive integer.")
-    fig, ax = plt.subplots()
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
     ax.hist(data, bins=bins)
     ax.set_title(title)
     return fig
@@ -41,7 +44,6 @@ def test_generate_chart_with_random_data(data, bins):
     assert buf.read(4) == b"\x89PNG"
     bars = fig.axes[0].patches
     assert len(bars) == bins
-    plt.close(fig)
 
 def test_chart_custom_title():
     data = [1, 2, 3]
@@ -49,7 +51,6 @@ def test_chart_custom_title():
     title = "Custom Hist Title"
     fig = generate_histogram_chart(data, bins, title=title)
     assert fig.axes[0].get_title() == title
-    plt.close(fig)
 
 @pytest.mark.parametrize(
     "bad_data, bad_bins, expected_exception",
@@ -78,7 +79,6 @@ def test_chart_extreme_values(extreme_data, bins):
     fig = generate_histogram_chart(extreme_data, bins)
     bars = fig.axes[0].patches
     assert len(bars) == bins
-    plt.close(fig)
 
 def test_chart_bar_count():
     data = [5, 15, 25]
@@ -86,4 +86,3 @@ def test_chart_bar_count():
     fig = generate_histogram_chart(data, bins)
     bars = fig.axes[0].patches
     assert len(bars) == bins
-    plt.close(fig)
@@ -0,0 +1,81 @@
+import csv
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+import matplotlib
+
+matplotlib.use("Agg")
+
+from charts import generate, instrument
+from charts.registry import Job
+
+
+@pytest.fixture(autouse=True)
+def stop_tracemalloc():
+    # Profiles start tracemalloc, which would slow down every later test.
+    yield
+    tracemalloc.stop()
+
+
+def test_profile_records_each_stage():
+    profile = instrument.Profile("line_chart_1")
+    with profile.stage("data"):
+        block = np.ones(2**20)  # 8 MiB
+    with profile.stage("draw"):
+        pass
+    del block
+
+    data, draw = profile.records
+    assert [data["stage"], draw["stage"]] == ["data", "draw"]
+    assert data["chart"] == "line_chart_1" and data["pid"] == os.getpid()
+    assert data["peak_bytes"] >= 8 * 2**20 > draw["peak_bytes"]
+    assert data["wall"] >= 0 and data["cpu"] >= 0
+    assert draw["start"] >= data["start"] + data["wall"]
+
+
+def test_disabled_profile_records_nothing():
+    with instrument.DISABLED.stage("data"):
+        pass
+    assert list(instrument.DISABLED.records) == []
+
+
+def test_generate_records_stages_and_writes_reports(tmp_path):
+    out, data = str(tmp_path / "output"), str(tmp_path / "test_data")
+    jobs = [Job("heatmap", 1, 5), Job("line_chart", 1, 10)]
+    results = generate.generate(jobs, output_dir=out, data_dir=data, profile=True,
+                                data_formats=("json", "binary"), formats=("html", "png"))
+    for r in results:
+        assert [s["stage"] for s in r.stats["stages"]] == [
+            "data", "hash", "draw", "static", "html", "json", "sidecar",
+        ]
+    records = [s for r in results for s in r.stats["stages"]]
+
+    report_dir = str(tmp_path / "profile")
+    instrument.write_reports(records, report_dir)
+    with open(os.path.join(report_dir, "stages.json")) as f:
+        assert json.load(f) == records
+    with open(os.path.join(report_dir, "stages.csv")) as f:
+        rows = list(csv.DictReader(f))
+    assert [(row["chart"], row["stage"]) for row in rows] == [
+        (s["chart"], s["stage"]) for s in records
+    ]
+    with open(os.path.join(report_dir, "trace.json")) as f:
+        events = json.load(f)["traceEvents"]
+    assert len(events) == len(records) and min(e["ts"] for e in events) == 0
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+
+    totals = instrument.summarize(records)
+    assert set(totals) == {"data", "hash", "draw", "static", "html", "json", "sidecar"}
+    assert totals["html"]["wall"] == sum(s["wall"] for s in records if s["stage"] == "html")
+
+
+def test_unprofiled_generate_has_no_stages(tmp_path):
+    (result,) = generate.generate([Job("pie_chart", 1, 4)], output_dir=str(tmp_path / "o"),
+                                  data_dir=str(tmp_path / "d"))
+    assert result.stats["stages"] == []
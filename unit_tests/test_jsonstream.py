@@ -0,0 +1,56 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import io
+import json
+import tracemalloc
+
+import pytest
+import numpy as np
+
+from charts import jsonstream
+
+
+def reference_json(obj, indent):
+    as_lists = json.loads(json.dumps(obj, default=lambda o: o.tolist()))
+    return json.dumps(as_lists, indent=indent, separators=None if indent else (",", ":"))
+
+
+test_payloads = [
+    {"chart_type": "line_chart", "version": 1, "x": np.linspace(0, 1, 11), "y": np.sin(np.arange(11))},
+    {"data": np.random.default_rng(0).random((4, 3)), "labels": ["a", "b"]},
+    {"data": [np.arange(5), np.arange(3, dtype=np.int32), np.array([], dtype=float)]},
+    {"nested": {"values": np.array([1.5, np.nan, np.inf, -np.inf])}, "empty": {}, "flags": np.array([True, False])},
+    {"scalars": [np.int64(3), np.float32(0.1), np.bool_(True), None, "text"]},
+]
+
+
+@pytest.mark.parametrize("indent", [2, None])
+@pytest.mark.parametrize("payload", test_payloads)
+def test_dump_matches_json_module(payload, indent):
+    buf = io.StringIO()
+    jsonstream.dump(payload, buf, indent=indent, chunk_size=3)
+    assert buf.getvalue() == reference_json(payload, indent)
+
+
+def test_compact_output_has_no_whitespace():
+    buf = io.StringIO()
+    jsonstream.dump({"x": np.arange(4)}, buf)
+    assert buf.getvalue() == '{"x":[0,1,2,3]}'
+
+
+def test_dump_memory_does_not_scale_with_array_size(tmp_path):
+    data = {"x": np.random.default_rng(0).random(1_000_000)}
+    tracemalloc.start()
+    try:
+        with open(tmp_path / "data.json", "w") as f:
+            jsonstream.dump(data, f)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # ``data["x"].tolist()`` alone would take over 30 MB.
+    assert peak < 16 * 1024 * 1024
+    with open(tmp_path / "data.json") as f:
+        assert np.array_equal(json.load(f)["x"], data["x"])
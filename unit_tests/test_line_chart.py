@@ -4,7 +4,8 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../matplotlib")))
 
 import pytest
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import matplotlib
 
 matplotlib.use("Agg")
@@ -18,7 +19,9 @@ def generate_line_chart(data, labels, title="Line Chart"):
         raise ValueError("Data and labels must have the same length.")
     if not data or not labels:
         raise ValueError("Data and labels cannot be empty.")
-    fig, ax = plt.subplots()
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
     ax.plot(labels, data)
     ax.set_title(title)
     return fig
@@ -43,7 +46,6 @@ def test_generate_chart_with_random_data(data, labels):
     xticklabels = [tick.get_text() for tick in fig.axes[0].get_xticklabels()]
     assert xticklabels == labels
     assert len(xticklabels) == len(data)
-    plt.close(fig)
 
 def test_chart_custom_title():
     data = [10, 20]
@@ -51,7 +53,6 @@ def test_chart_custom_title():
     title = "Custom Line Title"
     fig = generate_line_chart(data, labels, title=title)
     assert fig.axes[0].get_title() == title
-    plt.close(fig)
 
 @pytest.mark.parametrize(
     "bad_data, bad_labels, expected_exception",
@@ -84,7 +85,6 @@ def test_chart_extreme_values(extreme_data, labels):
     xticklabels = [tick.get_text() for tick in fig.axes[0].get_xticklabels()]
     assert xticklabels == labels
     assert len(xticklabels) == len(extreme_data)
-    plt.close(fig)
 
 def test_chart_line_count():
     data = [5, 15, 25]
@@ -92,4 +92,3 @@ def test_chart_line_count():
     fig = generate_line_chart(data, labels)
     lines = fig.axes[0].lines
     assert len(lines) == 1
-    plt.close(fig)
@@ -0,0 +1,82 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+
+import pytest
+import numpy as np
+
+from charts import generate, loader
+from charts.loader import ChartDataLoader
+from charts.registry import iter_jobs
+
+
+@pytest.fixture(scope="module")
+def data_dirs(tmp_path_factory):
+    # The same charts generated once as JSON only and once with sidecars.
+    dirs = {}
+    for formats in [("json",), ("json", "binary")]:
+        root = tmp_path_factory.mktemp("_".join(formats))
+        generate.generate(iter_jobs(["line_chart", "box_plot", "heatmap", "pie_chart"]),
+                          output_dir=str(root / "output"), data_dir=str(root / "test_data"),
+                          data_formats=formats)
+        dirs[formats[-1]] = str(root / "test_data")
+    return dirs
+
+
+def assert_close(actual, expected):
+    # Nested lists may be ragged (e.g. box plot fliers), so compare row by row.
+    if expected and all(isinstance(v, list) for v in expected):
+        assert len(actual) == len(expected)
+        for a, e in zip(actual, expected):
+            assert_close(a, e)
+    else:
+        assert np.allclose(np.asarray(actual, dtype=float), expected)
+
+
+@pytest.mark.parametrize("kind", ["json", "binary"])
+@pytest.mark.parametrize("chart_type", ["line_chart", "box_plot", "heatmap", "pie_chart"])
+def test_load_matches_json(data_dirs, kind, chart_type):
+    data = ChartDataLoader(data_dirs[kind]).load(chart_type, 2)
+    with open(os.path.join(data_dirs["json"], f"{chart_type}_2.json")) as f:
+        expected = json.load(f)
+
+    assert data["chart_type"] == chart_type and data["version"] == 2
+    for key, value in expected.items():
+        if key == "labels":
+            assert data[key] == value
+        elif isinstance(value, list):
+            assert_close(data[key], value)
+
+
+def test_binary_data_is_memory_mapped(data_dirs):
+    data = ChartDataLoader(data_dirs["binary"]).load("heatmap", 2)
+    assert isinstance(data["data"], np.memmap)
+    assert data["data"].shape == (20, 20)
+
+
+def test_lru_cache(data_dirs):
+    charts = ChartDataLoader(data_dirs["binary"], maxsize=2)
+    first = charts.load("line_chart", 1)
+    assert charts.load("line_chart", 1) is first
+    charts.load("line_chart", 2)
+    charts.load("heatmap", 1)  # evicts line_chart 1
+    assert len(charts) == 2
+    assert charts.load("line_chart", 1) is not first
+    assert (charts.hits, charts.misses) == (1, 4)
+
+
+def test_reload_when_file_changes(tmp_path):
+    path = tmp_path / "line_chart_1.json"
+    path.write_text('{"x": [1, 2]}')
+    charts = ChartDataLoader(str(tmp_path))
+    assert charts.load("line_chart", 1)["x"].tolist() == [1, 2]
+    path.write_text('{"x": [1, 2, 3]}')
+    assert charts.load("line_chart", 1)["x"].tolist() == [1, 2, 3]
+
+
+def test_missing_data_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        loader.load("line_chart", 1, data_dir=str(tmp_path))
@@ -8,7 +8,8 @@ sys.path.insert(
 )
 
 import pytest
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import matplotlib
 matplotlib.use('Agg')
 from io import BytesIO
@@ -26,7 +27,9 @@ def generate_pie_chart(data, labels, title="Pie Chart",colors=None):
     if all(x == 0 for x in data):
         raise ValueError("All data values are zero, cannot create a pie chart.")
     
-    fig, ax = plt.subplots()
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
     ax.pie(data, labels=labels, autopct='%1.1f%%', colors=colors)
     ax.set_title(title)
     return fig
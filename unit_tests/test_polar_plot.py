@@ -7,7 +7,8 @@ sys.path.insert(
 )
 
 import pytest
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import matplotlib
 
 matplotlib.use("Agg")  # Use non-interactive backend for testing
@@ -24,7 +25,8 @@ def generate_polar_plot(theta,r, linewidth=1.5,color="b",title="Polar Plot"):
     if len(theta) == 0:
         raise ValueError("theta and r cannot be empty.")
 
-    fig = plt.figure()
+    fig = Figure()
+    FigureCanvasAgg(fig)
     ax = fig.add_subplot(111, polar=True)
     ax.plot(theta, r, linewidth=linewidth, color=color)
     ax.set_title(title)
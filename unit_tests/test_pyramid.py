@@ -0,0 +1,96 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import base64
+import json
+
+import pytest
+import numpy as np
+
+from charts import generate, pagedata
+from charts.figpool import FigurePool
+from charts.pyramid import build_levels, thin_grid
+from charts.registry import iter_jobs
+
+
+def line(n=100000):
+    x = np.linspace(0, 10, n)
+    return x, np.sin(x)
+
+
+@pytest.mark.parametrize("kind", ["line", "area"])
+def test_line_levels_grow_and_stay_sorted(kind):
+    x, y = line()
+    levels = build_levels(x, y, kind, 1000)
+    assert len(levels[0]) <= 1000
+    assert all(len(a) < len(b) for a, b in zip(levels, levels[1:]))
+    assert len(levels[-1]) <= len(x) // 2
+    for level in levels:
+        assert np.all(np.diff(x[level]) > 0)
+        assert np.argmax(y) in level and np.argmin(y) in level
+
+
+def test_scatter_levels_end_with_all_points():
+    rng = np.random.default_rng(0)
+    x, y = rng.random(50000), rng.random(50000)
+    levels = build_levels(x, y, "scatter", 1000)
+    assert len(levels[0]) <= 1000
+    assert np.array_equal(np.sort(levels[-1]), np.arange(50000))
+    for level in levels:
+        assert np.all(np.diff(x[level]) >= 0)
+
+
+def test_thin_grid_keeps_one_point_per_cell():
+    rng = np.random.default_rng(1)
+    x, y = rng.random(10000), rng.random(10000)
+    assert len(thin_grid(x, y, 100)) == 100
+    # Degenerate data collapses into a single cell.
+    assert len(thin_grid(np.zeros(10), np.zeros(10), 100)) == 1
+
+
+def test_unknown_kind():
+    with pytest.raises(ValueError):
+        build_levels(*line(), "polar", 1000)
+
+
+def test_generate_embeds_pyramid(tmp_path):
+    out, data = tmp_path / "output", tmp_path / "test_data"
+    jobs = iter_jobs(["line_chart", "scatter_plot"], {"*": [10, 20000]})
+    generate.generate(jobs, output_dir=str(out), data_dir=str(data), pyramid=True)
+
+    with open(data / "scatter_plot_2.json") as f:
+        reduced = json.load(f)
+    reduction = reduced["reduction"]
+    assert reduction["method"] == "pyramid" and reduction["original_points"] == 20000
+    assert reduction["levels"][0] == len(reduced["exported_indices"]) <= reduction["budget"]
+    assert len(reduced["x"]) == 20000
+    assert "zoomdetail" in (out / "scatter_plot_2.html").read_text()
+
+    # The page data takes 4 bytes a value, plus the indices of the levels but
+    # the finest, before base64; the evenly spaced x of lines is left out.
+    for chart, bytes_per_point in [("line_chart_2", 6), ("scatter_plot_2", 10)]:
+        page = (out / f"{chart}.html").read_text()
+        assert len(page[:page.index("</script>")]) * 3 / 4 < bytes_per_point * 20000
+
+    # Charts that fit the axes are exported without the plugin.
+    assert "zoomdetail" not in (out / "line_chart_1.html").read_text()
+
+
+def test_encode_values():
+    assert pagedata.encode_values(np.linspace(0, 10, 1001)) == {"start": 0.0, "step": 0.01}
+    values = np.random.default_rng(2).standard_normal(1000)
+    encoded = pagedata.encode_values(values)
+    offsets = np.frombuffer(base64.b64decode(encoded["data"]), "<u4")
+    assert np.allclose(encoded["start"] + encoded["step"] * offsets, values,
+                       rtol=0, atol=np.ptp(values) / 2**32)
+
+
+def test_release_drops_mpld3_plugins():
+    pool = FigurePool()
+    with pool.figure() as fig:
+        fig.mpld3_plugins = ["plugin"]
+    with pool.figure() as reused:
+        assert reused is fig
+        assert not hasattr(reused, "mpld3_plugins")
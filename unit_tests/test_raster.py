@@ -0,0 +1,96 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import base64
+import json
+
+import pytest
+import numpy as np
+from matplotlib.collections import QuadMesh
+from PIL import Image
+
+import charts.builders  # noqa: F401
+from charts import generate, raster, sidecar
+from charts.figpool import new_figure
+from charts.registry import CHART_REGISTRY, Job, iter_jobs, job_rng
+
+
+def matrix(rows=37, cols=50):
+    return np.random.default_rng(0).random((rows, cols))
+
+
+def test_quantize_matches_imshow():
+    data = matrix()
+    fig = new_figure()
+    image = fig.axes[0].imshow(data, cmap="viridis")
+    expected = image.to_rgba(data, bytes=True, norm=True)
+    assert np.array_equal(raster.quantize(data, "viridis", data.min(), data.max()), expected)
+
+
+@pytest.mark.parametrize("fmt", raster.IMAGE_FORMATS)
+def test_write_image_is_lossless(tmp_path, fmt):
+    rgba = raster.quantize(matrix(), "viridis")
+    path = str(tmp_path / f"heatmap.{fmt}")
+    raster.write_image(rgba, path, fmt)
+    assert np.array_equal(np.asarray(Image.open(path).convert("RGBA")), rgba)
+
+
+def test_tiles(tmp_path):
+    rgba = raster.quantize(matrix(300, 130), "viridis")
+    stem = str(tmp_path / "heatmap_1")
+    tiles = raster.write_tiles(rgba, stem, tile_size=64)
+    assert tiles["levels"] == [[38, 17], [75, 33], [150, 65], [300, 130]]
+    paths = raster.tile_paths(stem, rgba.shape, tile_size=64)
+    assert all(os.path.exists(p) for p in paths)
+    assert len(paths) == 1 + 2 + 3 * 2 + 5 * 3
+    with Image.open(os.path.join(f"{stem}_tiles", "3", "4_2.png")) as tile:
+        assert tile.size == (2, 300 - 4 * 64)
+
+
+@pytest.mark.parametrize("dtype", sorted(raster.DTYPES))
+def test_generate_raster_heatmap(tmp_path, dtype):
+    out, data_dir = tmp_path / "output", tmp_path / "test_data"
+    generate.generate(iter_jobs(["heatmap"], {"heatmap": [300]}), output_dir=str(out),
+                      data_dir=str(data_dir), raster="png", raster_dtype=dtype,
+                      raster_tiles=128)
+
+    with open(data_dir / "heatmap_1.json") as f:
+        saved = json.load(f)
+    assert "data" not in saved
+    assert saved["raster"]["shape"] == [300, 300] and saved["raster"]["dtype"] == raster.DTYPES[dtype]
+
+    data = sidecar.read(str(data_dir / "heatmap_1.bin.json"))
+    assert data["data"].dtype == np.dtype(raster.DTYPES[dtype])
+    expected = CHART_REGISTRY["heatmap"].make_data(300, job_rng(Job("heatmap", 1, 300)))["data"]
+    assert np.allclose(data["data"], expected, atol=1e-3)
+
+    # The HTML embeds exactly the image written next to the test data.
+    html = (out / "heatmap_1.html").read_text()
+    with open(data_dir / "heatmap_1.png", "rb") as f:
+        assert base64.b64encode(f.read()).decode() in html
+    assert (data_dir / "heatmap_1_tiles" / "2" / "2_2.png").exists()
+
+
+def test_raster_mode_draws_like_imshow():
+    data = matrix()
+    image = raster.quantize(data, "viridis", data.min(), data.max())
+    direct, rastered = new_figure(), new_figure()
+    CHART_REGISTRY["heatmap"].draw(direct.axes[0], {"data": data})
+    CHART_REGISTRY["heatmap"].draw(rastered.axes[0], {"data": data, "image": image,
+                                                      "cmap": "viridis",
+                                                      "vmin": data.min(), "vmax": data.max()})
+    assert len(rastered.axes) == 2
+    assert np.array_equal(rastered.axes[0].images[0].get_array(), image)
+    assert rastered.axes[1].get_ylim() == direct.axes[1].get_ylim()
+
+
+def test_raster_colorbar_uses_the_image_cmap():
+    data = matrix()
+    fig = new_figure()
+    CHART_REGISTRY["heatmap"].draw(fig.axes[0], {
+        "data": data, "image": raster.quantize(data, "plasma", data.min(), data.max()),
+        "cmap": "plasma", "vmin": data.min(), "vmax": data.max()})
+    (solids,) = [c for c in fig.axes[1].collections if isinstance(c, QuadMesh)]
+    assert solids.get_cmap().name == "plasma"
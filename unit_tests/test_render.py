@@ -0,0 +1,41 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+from charts.builders import build_figure
+from charts.registry import CHART_REGISTRY, iter_jobs, job_rng
+from charts.render import render, render_many
+
+
+@pytest.fixture(scope="module")
+def figures(render_cache):
+    figs = []
+    for job in iter_jobs():
+        data = CHART_REGISTRY[job.chart_type].make_data(job.size, job_rng(job))
+        figs.append(render_cache.figure(build_figure, job.chart_type, data))
+    return figs
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_render_many_matches_serial_rendering(figures, workers):
+    buffers = render_many(figures, workers=workers)
+    assert buffers == [render(fig) for fig in figures]
+    assert all(buf[:4] == b"\x89PNG" for buf in buffers)
+
+
+def test_render_many_repeated_figure(figures):
+    fig = figures[0]
+    buffers = render_many([fig, figures[1], fig], workers=3)
+    assert buffers[0] == buffers[2] == render(fig)
+
+
+def test_render_many_svg(figures):
+    buffers = render_many(figures[:3], fmt="svg", workers=2)
+    assert all(b"<svg" in buf for buf in buffers)
+
+
+def test_render_many_empty():
+    assert render_many([], workers=4) == []
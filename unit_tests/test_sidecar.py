@@ -0,0 +1,71 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+
+import pytest
+import numpy as np
+
+from charts import generate, sidecar
+from charts.registry import iter_jobs
+
+
+def make_payload():
+    rng = np.random.default_rng(0)
+    return {
+        "chart_type": "box_plot",
+        "version": 1,
+        "x": np.arange(5),
+        "grid": rng.random((3, 4)),
+        "groups": [rng.standard_normal(7), rng.standard_normal(3)],
+        "labels": ["a", "b"],
+        "empty": np.array([], dtype=float),
+    }
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_round_trip(tmp_path, mmap):
+    payload = make_payload()
+    header_path, blob_path = sidecar.write(payload, str(tmp_path / "box_plot_1"))
+    data = sidecar.read(header_path, mmap=mmap)
+
+    assert data["chart_type"] == "box_plot" and data["labels"] == ["a", "b"]
+    assert np.array_equal(data["x"], payload["x"]) and data["x"].dtype == np.float64
+    assert np.array_equal(data["grid"], payload["grid"])
+    assert data["empty"].shape == (0,)
+    for group, expected in zip(data["groups"], payload["groups"]):
+        assert np.array_equal(group, expected)
+    if mmap:
+        assert isinstance(data["grid"], np.memmap)
+
+
+def test_header_offsets_are_aligned(tmp_path):
+    header_path, blob_path = sidecar.write(make_payload(), str(tmp_path / "chart_1"))
+    with open(header_path) as f:
+        header = json.load(f)
+    entries = [header["arrays"]["x"], header["arrays"]["grid"], *header["arrays"]["groups"]]
+    for entry in entries:
+        assert entry["dtype"] == "<f8"
+        assert entry["offset"] % 8 == 0
+        assert entry["nbytes"] == 8 * int(np.prod(entry["shape"]))
+    assert os.path.getsize(blob_path) == max(e["offset"] + e["nbytes"] for e in entries)
+
+
+def test_read_rejects_other_json(tmp_path):
+    path = tmp_path / "line_chart_1.json"
+    path.write_text('{"x": [1, 2]}')
+    with pytest.raises(ValueError):
+        sidecar.read(str(path))
+
+
+def test_generate_writes_binary_sidecar(tmp_path):
+    out, data = str(tmp_path / "output"), str(tmp_path / "test_data")
+    results = generate.generate(iter_jobs(["heatmap"]), output_dir=out, data_dir=data,
+                                data_formats=("json", "binary"))
+    for r in results:
+        json_path, header_path, blob_path = r.data_paths
+        with open(json_path) as f:
+            expected = json.load(f)
+        assert np.array_equal(sidecar.read(header_path)["data"], expected["data"])
@@ -0,0 +1,46 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import subprocess
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Total self time of every module imported by ``generate.py --help``, in
+# microseconds.  numpy accounts for most of it; matplotlib alone would take
+# about as much again.
+HELP_IMPORT_BUDGET_US = 350_000
+
+
+def imported_modules(*args):
+    """Run ``generate.py`` with ``args`` under ``-X importtime``.
+
+    Returns ``{module: self time in microseconds}``.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "charts/generate.py", *args],
+                            cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            self_us, _, name = line[len("import time:"):].split("|")
+            if self_us.strip().isdigit():
+                modules[name.strip()] = int(self_us)
+    return modules
+
+
+def test_help_does_not_import_matplotlib():
+    modules = imported_modules("--help")
+    heavy = [name for name in modules
+             if name.split(".")[0] in ("matplotlib", "mpld3", "PIL")
+             or name in ("charts.builders", "charts.figpool", "charts.cache")]
+    assert heavy == []
+    assert sum(modules.values()) < HELP_IMPORT_BUDGET_US
+
+
+def test_single_chart_skips_optional_exporters(tmp_path):
+    modules = imported_modules("--charts", "pie_chart", "--workers", "1",
+                               "--output-dir", str(tmp_path / "output"),
+                               "--data-dir", str(tmp_path / "test_data"))
+    assert "charts.builders" in modules and "mpld3" in modules
+    assert not {"charts.zoom", "charts.canvas", "charts.pagedata"} & set(modules)
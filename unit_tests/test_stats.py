@@ -0,0 +1,98 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from io import BytesIO
+
+import pytest
+import numpy as np
+from matplotlib import cbook
+
+import charts.builders  # noqa: F401
+from charts.figpool import new_figure
+from charts.loader import ChartDataLoader
+from charts.registry import CHART_REGISTRY, Job, iter_jobs, job_rng
+from charts.stats import BOX_STATS, box_stats, bxp_stats, histogram_stats
+from charts import generate
+
+
+def render(fig):
+    buf = BytesIO()
+    fig.savefig(buf, format="png")
+    return buf.getvalue()
+
+
+def groups(seed=0):
+    rng = np.random.default_rng(seed)
+    ragged = [rng.standard_normal(5 + 11 * i) for i in range(4)]
+    return ragged + [np.array([1.0, 1.0, 1.0, 50.0]), np.array([2.0])]
+
+
+def test_box_stats_match_matplotlib():
+    data = groups()
+    stats = box_stats(data)
+    for i, expected in enumerate(cbook.boxplot_stats(data)):
+        for key in BOX_STATS:
+            assert stats[key][i] == pytest.approx(expected[key])
+        assert np.array_equal(np.sort(stats["fliers"][i]), np.sort(expected["fliers"]))
+
+
+def test_box_stats_of_2d_array_equal_list_of_rows():
+    samples = np.random.default_rng(1).standard_normal((4, 50))
+    as_array, as_list = box_stats(samples), box_stats(list(samples))
+    for key in BOX_STATS:
+        assert np.array_equal(as_array[key], as_list[key])
+
+
+def test_bxp_stats_draw_like_boxplot():
+    data = groups()
+    fig, expected = new_figure(), new_figure()
+    fig.axes[0].bxp(bxp_stats(box_stats(data)))
+    expected.axes[0].boxplot(data)
+    assert render(fig) == render(expected)
+
+
+def test_histogram_stats():
+    data = np.random.default_rng(2).standard_normal(1000)
+    stats = histogram_stats(data, bins=10)
+    counts, bins = np.histogram(data, bins=10)
+    assert np.array_equal(stats["counts"], counts) and np.array_equal(stats["bins"], bins)
+    assert stats["counts"].sum() == 1000
+
+
+@pytest.mark.parametrize("chart_type, reference", [
+    ("histogram", lambda ax, data: ax.hist(data["data"], bins=10)),
+    ("box_plot", lambda ax, data: ax.boxplot(data["data"])),
+])
+def test_precomputed_chart_matches_matplotlib(chart_type, reference):
+    spec = CHART_REGISTRY[chart_type]
+    data = spec.make_data(spec.sizes[-1], job_rng(Job(chart_type, 2, spec.sizes[-1])))
+    fig = new_figure()
+    spec.draw(fig.axes[0], data)
+    expected = new_figure()
+    reference(expected.axes[0], data)
+    expected.axes[0].set_title(fig.axes[0].get_title())
+    assert render(fig) == render(expected)
+
+
+def test_stats_are_saved_with_test_data(tmp_path):
+    out, data_dir = tmp_path / "output", tmp_path / "test_data"
+    generate.generate(iter_jobs(["histogram", "box_plot"]), output_dir=str(out),
+                      data_dir=str(data_dir))
+    loader = ChartDataLoader(str(data_dir))
+
+    box = loader.load("box_plot", 2)
+    stats = box_stats(box["data"])
+    for key in BOX_STATS:
+        assert np.allclose(box[key], stats[key])
+    assert len(box["fliers"]) == 4
+    assert all(isinstance(f, np.ndarray) for f in box["fliers"])
+    hist = loader.load("histogram", 2)
+    assert hist["counts"].sum() == len(hist["data"])
+    assert len(hist["bins"]) == len(hist["counts"]) + 1
+
+    # Everything needed to redraw the chart is in the test data.
+    redrawn = new_figure()
+    CHART_REGISTRY["box_plot"].draw(redrawn.axes[0], {k: v for k, v in box.items() if k != "data"})
+    assert len(redrawn.axes[0].lines) > 0
@@ -7,7 +7,9 @@ sys.path.insert(
 )
 
 import pytest
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.lines import Line2D
 import matplotlib
 
 matplotlib.use("Agg")  # Use non-interactive backend for testing
@@ -24,7 +26,9 @@ def generate_stem_plot(data, labels, title="Stem Plot"):
     if not data or not labels:
         raise ValueError("Data and labels cannot be empty.")
 
-    fig, ax = plt.subplots()
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
     ax.stem(range(len(data)), data)  # <-- FIX: removed use_line_collection
     ax.set_xticks(range(len(labels)))
     ax.set_xticklabels(labels)
@@ -118,7 +122,7 @@ def test_stem_plot_xticklabels_and_marker_count():
     markerlines = [
         child
         for child in ax.get_children()
-        if isinstance(child, plt.Line2D) and child.get_marker() != "None"
+        if isinstance(child, Line2D) and child.get_marker() != "None"
     ]
     assert len(markerlines) >= 1  # At least one Line2D with markers
 
@@ -0,0 +1,80 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import io
+import json
+import subprocess
+
+import pytest
+import matplotlib
+
+matplotlib.use("Agg")
+
+from charts import generate, worker
+from charts.registry import Job
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+@pytest.fixture(autouse=True)
+def restore_cache(monkeypatch):
+    # Workers set the manifest of charts.generate for the whole process.
+    monkeypatch.setattr(generate, "_cache", None)
+
+
+def _args(tmp_path, *extra):
+    return generate.parse_args(["--charts", "pie_chart", "--output-dir", str(tmp_path / "output"),
+                                "--data-dir", str(tmp_path / "test_data"), *extra])
+
+
+def _serve(w, *requests):
+    out = io.StringIO()
+    worker.serve(w, [json.dumps(request) + "\n" for request in requests], out)
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_plan_run_finish_matches_generate(tmp_path):
+    w = worker.Worker(_args(tmp_path, "--bundle", "2"))
+    (plan,) = _serve(w, {"id": 0, "op": "plan"})
+    assert plan == {"id": 0, "jobs": [["pie_chart", 1, 4], ["pie_chart", 2, 8]]}
+    runs = _serve(w, *({"id": i + 1, "op": "run", "job": job} for i, job in enumerate(plan["jobs"])))
+    assert [run["id"] for run in runs] == [1, 2]
+    assert all(not run["cached"] and run["seconds"] > 0 for run in runs)
+    assert all(os.path.exists(run["chart_paths"]["html"]) for run in runs)
+
+    (finish,) = _serve(w, {"id": 3, "op": "finish", "results": runs})
+    assert finish["summary"][0] == "Rendered 2 charts, 0 already up to date."
+    assert os.path.exists(tmp_path / "output" / "bundles" / "bundles.json")
+
+    # The manifest written by the worker is the one generate.py would write.
+    expected = generate.generate([Job("pie_chart", 1, 4), Job("pie_chart", 2, 8)],
+                                 output_dir=str(tmp_path / "output"),
+                                 data_dir=str(tmp_path / "test_data"))
+    assert [r.cached for r in expected] == [True, True]
+    assert [r.digest for r in expected] == [run["digest"] for run in runs]
+
+
+def test_errors_are_replied(tmp_path):
+    w = worker.Worker(_args(tmp_path))
+    out = io.StringIO()
+    worker.serve(w, ['{"id": 1, "op": "run", "job": ["nope", 1, 4]}\n', "not json\n",
+                     '{"id": 2, "op": "plan"}\n'], out)
+    replies = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert replies[0]["id"] == 1 and "KeyError" in replies[0]["error"]
+    assert replies[1]["id"] is None and "JSONDecodeError" in replies[1]["error"]
+    assert replies[2]["jobs"]
+
+
+def test_protocol_over_stdio(tmp_path):
+    requests = [{"id": 0, "op": "plan"}, {"id": 1, "op": "run", "job": ["pie_chart", 1, 4]}]
+    result = subprocess.run(
+        [sys.executable, "charts/worker.py", "--charts", "pie_chart",
+         "--output-dir", str(tmp_path / "output"), "--data-dir", str(tmp_path / "test_data")],
+        cwd=REPO_ROOT, input="".join(json.dumps(r) + "\n" for r in requests),
+        capture_output=True, text=True, check=True)
+    ready, plan, run = map(json.loads, result.stdout.splitlines())
+    assert ready["ready"] and ready["pid"] > 0
+    assert plan["id"] == 0 and run["id"] == 1
+    assert run["chart_paths"]["html"].endswith("pie_chart_1.html")